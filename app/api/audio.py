@@ -1,5 +1,5 @@
 from fastapi import APIRouter, HTTPException, UploadFile, File, Depends, BackgroundTasks, Form
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from typing import Optional, List, Dict
 from datetime import datetime
 import uuid
@@ -26,6 +26,9 @@ from app.services.audio_service import AudioService
 from app.services.openai_service import OpenAIService
 from app.core.config import settings
 from app.api.auth import get_current_user
+from app.api.cases import invalidate_case_cache
+from app.api.media import MEDIA_CACHE_PREFIX
+from app.core.cache import response_cache
 
 # No longer needed - using S3 for file storage
 
@@ -221,6 +224,8 @@ async def process_transcription(
                     confidence=result.confidence,
                     follow_up_questions=follow_up_questions
                 )
+                await response_cache.delete_prefix(MEDIA_CACHE_PREFIX)
+                await invalidate_case_cache(job_details.case_id)
                 logger.info(f"Audio saved to media table for case {job_details.case_id}")
         except Exception as e:
             logger.warning(f"Failed to save to media table: {e}")
@@ -478,15 +483,15 @@ async def get_transcripts_by_case_id(
         # Convert to response format
         transcript_responses = []
         for transcript_data in transcripts_data:
-            transcript_responses.append(TranscriptResponse(
+            transcript_responses.append(TranscriptResponse.model_construct(
                 job_id=transcript_data['job_id'],
                 transcript=transcript_data['transcript'],
                 created_at=datetime.fromisoformat(transcript_data['created_at'].replace('Z', '+00:00')),
                 completed_at=datetime.fromisoformat(transcript_data['completed_at'].replace('Z', '+00:00')) if transcript_data.get('completed_at') else None
             ))
         
-        # Initialize response without analysis
-        response = CaseTranscriptsResponse(
+        # Initialize response without analysis; rows come from our own table, so skip validation
+        response = CaseTranscriptsResponse.model_construct(
             case_id=case_id,
             transcripts=transcript_responses,
             total_count=len(transcript_responses)
@@ -524,7 +529,7 @@ async def get_transcripts_by_case_id(
                 )
                 
                 # Add analysis to response
-                response.analysis = analysis
+                response = response.model_copy(update={"analysis": analysis})
                 
                 logger.info(f"Successfully completed AI analysis for case {case_id}")
                 
@@ -534,7 +539,8 @@ async def get_transcripts_by_case_id(
                 logger.info(f"Returning transcripts without analysis for case {case_id}")
         
         logger.info(f"Retrieved {len(transcript_responses)} transcripts for case: {case_id}")
-        return response
+        # Serialize once here instead of letting FastAPI re-validate the whole response model
+        return ORJSONResponse(response.model_dump(mode="json"))
         
     except Exception as e:
         logger.error(f"Failed to get transcripts for case {case_id}: {str(e)}")
@@ -656,7 +662,7 @@ async def debug_case_data(case_id: str):
     """Debug endpoint to see what data exists for a case ID."""
     try:
         # Get raw data from transcription_jobs table
-        result = audio_service.client.table('transcription_jobs').select('*').eq('case_id', case_id).execute()
+        result = await audio_service.client.table('transcription_jobs').select('*').eq('case_id', case_id).execute()
         
         return {
             "case_id": case_id,
@@ -718,17 +724,10 @@ async def analyze_audio(
         
         # Check if media record exists with this URL and case_id
         from app.core.database import supabase_client
-        client = supabase_client.get_client()
+        client = supabase_client.get_async_client()
         
-        media_response = client.table("media").select("*").eq("case_id", request.case_id).execute()
-        existing_media = None
-        
-        if media_response.data:
-            for media in media_response.data:
-                media_info = media.get("media_info", {})
-                if media_info.get("url") == request.url:
-                    existing_media = media
-                    break
+        media_response = await client.table("media").select("id, media_info").eq("case_id", request.case_id).eq("media_info->>url", request.url).limit(1).execute()
+        existing_media = media_response.data[0] if media_response.data else None
         
         if existing_media and existing_media.get("media_info", {}).get("transcript"):
             # Return existing media analysis
@@ -847,32 +846,23 @@ async def analyze_audio(
             audio_info=audio_info
         )
         
-        # Update or create media record
-        if existing_media:
-            # Update existing media record with transcript and follow-up questions
-            logger.info(f"Updating existing media record: {existing_media['id']}")
-            
-            # Update the media_info with transcript and follow-up questions
-            updated_media_info = existing_media["media_info"].copy()
-            updated_media_info.update({
+        # Merge results into the existing media record in one UPDATE ... RETURNING
+        update_result = await client.rpc("merge_media_info", {
+            "p_case_id": request.case_id,
+            "p_url": request.url,
+            "p_patch": {
                 "transcript": transcription_result.transcript,
                 "follow_up_questions": follow_up_questions,
                 "duration": transcription_result.duration,
                 "speakers": len(transcription_result.speakers),
                 "confidence": int(transcription_result.confidence * 100) if transcription_result.confidence else None
-            })
-            
-            # Update the media record
-            update_result = client.table("media").update({
-                "media_info": updated_media_info
-            }).eq("id", existing_media["id"]).execute()
-            
-            if update_result.data:
-                logger.info(f"Media record updated successfully: {existing_media['id']}")
-            else:
-                logger.error(f"Failed to update media record: {existing_media['id']}")
+            }
+        }).execute()
+        
+        if update_result.data:
+            logger.info(f"Media record updated successfully: {update_result.data[0]['id']}")
         else:
-            # Create new media record
+            # No media record for this URL yet, create one
             import uuid
             media_id = str(uuid.uuid4())
             await audio_service.save_audio_to_media_table(
@@ -888,6 +878,10 @@ async def analyze_audio(
                 follow_up_questions=follow_up_questions
             )
         
+        # Cached media listings and the case now miss the transcript
+        await response_cache.delete_prefix(MEDIA_CACHE_PREFIX)
+        await invalidate_case_cache(request.case_id)
+        
         logger.info(f"Audio analysis completed for case {request.case_id}")
         
         return AudioAnalyzeResponse(
@@ -1,17 +1,47 @@
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
 from app.schemas.audio_comparison import AudioComparisonResponse, AudioComparisonRequest, AudioComparisonWitness, DetailedAnalysis
 from app.core.database import supabase_client
+from app.api.cases import invalidate_case_cache
 from app.services.openai_service import OpenAIService
+from app.utils.streaming import aiter_json_array, aiter_query_rows
+from typing import Any, AsyncIterator, Dict
 import logging
 import uuid
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+COMPARISON_COLUMNS = "id,case_id,media_id1,media_id2,witnesses,detailed_analysis,created_at,updated_at"
+# Only the parts of media_info the comparison reads, extracted server-side
+COMPARISON_MEDIA_COLUMNS = "transcript:media_info->>transcript,title:media_info->>title"
+
 # Initialize OpenAI service
 openai_service = OpenAIService()
 
 
+def _comparison_row_to_dict(comparison_data: dict) -> dict:
+    """Project a case_audio_comparison row onto the AudioComparisonResponse fields."""
+    # Transform witnesses to use ev1/ev2 instead of UUIDs
+    witnesses = comparison_data["witnesses"]
+    for witness in witnesses:
+        if witness.get("audioId") == comparison_data["media_id1"]:
+            witness["audioId"] = "ev1"
+        elif witness.get("audioId") == comparison_data["media_id2"]:
+            witness["audioId"] = "ev2"
+
+    return {
+        "id": comparison_data["id"],
+        "caseId": comparison_data["case_id"],
+        "mediaId1": comparison_data["media_id1"],
+        "mediaId2": comparison_data["media_id2"],
+        "witnesses": witnesses,
+        "detailedAnalysis": comparison_data["detailed_analysis"],
+        "created_at": comparison_data.get("created_at"),
+        "updated_at": comparison_data.get("updated_at")
+    }
+
+
 @router.post("/compare", 
             response_model=AudioComparisonResponse,
             summary="Compare Two Audio Files",
@@ -38,29 +68,18 @@ async def compare_audio_files(request: AudioComparisonRequest):
     - Contradictions and similarities
     """
     try:
-        client = supabase_client.get_client()
+        client = supabase_client.get_async_client()
         
         # Check if comparison already exists
-        existing_comparison = client.table("case_audio_comparison").select("*").eq("case_id", request.caseId).eq("media_id1", request.mediaId1).eq("media_id2", request.mediaId2).execute()
+        existing_comparison = await client.table("case_audio_comparison").select(COMPARISON_COLUMNS).eq("case_id", request.caseId).eq("media_id1", request.mediaId1).eq("media_id2", request.mediaId2).limit(1).execute()
         
         if existing_comparison.data:
             logger.info(f"Returning existing comparison for case {request.caseId}")
-            comparison_data = existing_comparison.data[0]
-            
-            return AudioComparisonResponse(
-                id=comparison_data["id"],
-                caseId=comparison_data["case_id"],
-                mediaId1=comparison_data["media_id1"],
-                mediaId2=comparison_data["media_id2"],
-                witnesses=comparison_data["witnesses"],
-                detailedAnalysis=comparison_data["detailed_analysis"],
-                created_at=comparison_data.get("created_at"),
-                updated_at=comparison_data.get("updated_at")
-            )
+            return AudioComparisonResponse.model_validate(_comparison_row_to_dict(existing_comparison.data[0]))
         
         # Fetch media records
-        media1_response = client.table("media").select("*").eq("id", request.mediaId1).execute()
-        media2_response = client.table("media").select("*").eq("id", request.mediaId2).execute()
+        media1_response = await client.table("media").select(COMPARISON_MEDIA_COLUMNS).eq("id", request.mediaId1).limit(1).execute()
+        media2_response = await client.table("media").select(COMPARISON_MEDIA_COLUMNS).eq("id", request.mediaId2).limit(1).execute()
         
         if not media1_response.data:
             raise HTTPException(
@@ -78,8 +97,8 @@ async def compare_audio_files(request: AudioComparisonRequest):
         media2 = media2_response.data[0]
         
         # Extract transcripts
-        transcript1 = media1["media_info"].get("transcript", "")
-        transcript2 = media2["media_info"].get("transcript", "")
+        transcript1 = media1["transcript"] or ""
+        transcript2 = media2["transcript"] or ""
         
         if not transcript1:
             raise HTTPException(
@@ -94,8 +113,8 @@ async def compare_audio_files(request: AudioComparisonRequest):
             )
         
         # Generate witness names from media titles
-        witness1_name = media1["media_info"].get("title", "Witness 1")
-        witness2_name = media2["media_info"].get("title", "Witness 2")
+        witness1_name = media1["title"] or "Witness 1"
+        witness2_name = media2["title"] or "Witness 2"
         
         # Generate AI analysis
         logger.info(f"Generating AI analysis for audio comparison...")
@@ -103,16 +122,11 @@ async def compare_audio_files(request: AudioComparisonRequest):
             transcript1=transcript1,
             transcript2=transcript2,
             witness1_name=witness1_name,
-            witness2_name=witness2_name
+            witness2_name=witness2_name,
+            media_id1=request.mediaId1,
+            media_id2=request.mediaId2
         )
         
-        # Update witness analysis with evidence IDs
-        for witness in witnesses_analysis:
-            if witness["audioId"] == "media1":
-                witness["audioId"] = "ev1"
-            elif witness["audioId"] == "media2":
-                witness["audioId"] = "ev2"
-        
         # Save to database
         comparison_id = str(uuid.uuid4())
         insert_data = {
@@ -124,7 +138,7 @@ async def compare_audio_files(request: AudioComparisonRequest):
             "detailed_analysis": detailed_analysis
         }
         
-        result = client.table("case_audio_comparison").insert(insert_data).execute()
+        result = await client.table("case_audio_comparison").insert(insert_data).execute()
         
         if not result.data:
             raise HTTPException(
@@ -132,18 +146,11 @@ async def compare_audio_files(request: AudioComparisonRequest):
                 detail="Failed to save audio comparison"
             )
         
+        await invalidate_case_cache(request.caseId)
         logger.info(f"Audio comparison completed for case {request.caseId}")
         
-        return AudioComparisonResponse(
-            id=comparison_id,
-            caseId=request.caseId,
-            mediaId1=request.mediaId1,
-            mediaId2=request.mediaId2,
-            witnesses=witnesses_analysis,
-            detailedAnalysis=detailed_analysis,
-            created_at=result.data[0].get("created_at"),
-            updated_at=result.data[0].get("updated_at")
-        )
+        # Same ev1/ev2 witness mapping as the GET endpoints
+        return AudioComparisonResponse.model_validate(_comparison_row_to_dict(result.data[0]))
         
     except HTTPException:
         raise
@@ -163,32 +170,17 @@ async def compare_audio_files(request: AudioComparisonRequest):
 async def get_audio_comparisons_for_case(case_id: str):
     """Get all audio comparisons for a specific case."""
     try:
-        client = supabase_client.get_client()
-        
-        response = client.table("case_audio_comparison").select("*").eq("case_id", case_id).order("created_at", desc=True).execute()
-        
-        comparisons = []
-        for comparison_data in response.data:
-            # Transform witnesses to use ev1/ev2 instead of UUIDs
-            witnesses = comparison_data["witnesses"]
-            for witness in witnesses:
-                if witness.get("audioId") == comparison_data["media_id1"]:
-                    witness["audioId"] = "ev1"
-                elif witness.get("audioId") == comparison_data["media_id2"]:
-                    witness["audioId"] = "ev2"
-            
-            comparisons.append(AudioComparisonResponse(
-                id=comparison_data["id"],
-                caseId=comparison_data["case_id"],
-                mediaId1=comparison_data["media_id1"],
-                mediaId2=comparison_data["media_id2"],
-                witnesses=witnesses,
-                detailedAnalysis=comparison_data["detailed_analysis"],
-                created_at=comparison_data.get("created_at"),
-                updated_at=comparison_data.get("updated_at")
-            ))
-        
-        return comparisons
+        client = supabase_client.get_async_client()
+        
+        rows = await aiter_query_rows(
+            lambda: client.table("case_audio_comparison").select(COMPARISON_COLUMNS).eq("case_id", case_id).order("created_at", desc=True).order("id")
+        )
+        
+        async def items() -> AsyncIterator[Dict[str, Any]]:
+            async for comparison_data in rows:
+                yield _comparison_row_to_dict(comparison_data)
+        
+        return StreamingResponse(aiter_json_array(items()), media_type="application/json")
         
     except Exception as e:
         logger.error(f"Error fetching audio comparisons for case {case_id}: {e}")
@@ -206,36 +198,17 @@ async def get_audio_comparisons_for_case(case_id: str):
 async def get_audio_comparison_by_id(comparison_id: str):
     """Get a specific audio comparison by ID."""
     try:
-        client = supabase_client.get_client()
+        client = supabase_client.get_async_client()
         
-        response = client.table("case_audio_comparison").select("*").eq("id", comparison_id).execute()
+        response = await client.table("case_audio_comparison").select(COMPARISON_COLUMNS).eq("id", comparison_id).maybe_single().execute()
         
-        if not response.data:
+        if response is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Audio comparison not found"
             )
         
-        comparison_data = response.data[0]
-        
-        # Transform witnesses to use ev1/ev2 instead of UUIDs
-        witnesses = comparison_data["witnesses"]
-        for witness in witnesses:
-            if witness.get("audioId") == comparison_data["media_id1"]:
-                witness["audioId"] = "ev1"
-            elif witness.get("audioId") == comparison_data["media_id2"]:
-                witness["audioId"] = "ev2"
-        
-        return AudioComparisonResponse(
-            id=comparison_data["id"],
-            caseId=comparison_data["case_id"],
-            mediaId1=comparison_data["media_id1"],
-            mediaId2=comparison_data["media_id2"],
-            witnesses=witnesses,
-            detailedAnalysis=comparison_data["detailed_analysis"],
-            created_at=comparison_data.get("created_at"),
-            updated_at=comparison_data.get("updated_at")
-        )
+        return AudioComparisonResponse.model_validate(_comparison_row_to_dict(response.data))
         
     except HTTPException:
         raise
@@ -15,9 +15,9 @@ user_service = UserService()
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
     """Get current authenticated user."""
     try:
-        # Verify the token with Supabase
-        client = supabase_client.get_client()
-        user = client.auth.get_user(credentials.credentials)
+        # Verify the token with Supabase; get_user(jwt) is stateless, so the shared async client is safe to use
+        client = supabase_client.get_async_client()
+        user = await client.auth.get_user(credentials.credentials)
         return user.user.model_dump()
     except Exception as e:
         logger.error(f"Authentication error: {e}")
@@ -1,37 +1,54 @@
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
 from app.schemas.case_timeline import CaseTimelineResponse, CaseTimelineCreate, CaseTimelineUpdate
-from app.core.database import supabase_client
+from postgrest.exceptions import APIError
+from app.core.database import supabase_client, UNIQUE_VIOLATION, FOREIGN_KEY_VIOLATION, returning
+from app.utils.streaming import aiter_json_array, aiter_query_rows
+from typing import Any, AsyncIterator, Callable, Dict
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+TIMELINE_ORDER = "timeline_info->date->month, timeline_info->date->day, timeline_info->time"
+TIMELINE_FIELDS = (
+    "id", "time", "duration", "actor", "date",
+    "title", "type", "confidence", "evidence", "description"
+)
+
+
+def _timeline_row_to_dict(timeline_data: dict) -> dict:
+    """
+    Project a case_timeline row onto the CaseTimelineResponse fields.
+    
+    The entry's id is read from timeline_info, which TimelineInfo does not
+    define (seeded rows carry it), so the projection is not guaranteed to be
+    valid: single entries are validated, and rows missing a field raise KeyError.
+    """
+    timeline_info = timeline_data["timeline_info"]
+    return {field: timeline_info[field] for field in TIMELINE_FIELDS}
+
+
+async def _stream_timeline(query_factory: Callable[[], Any]) -> StreamingResponse:
+    """Stream the timeline rows returned by `query_factory` as a JSON array of CaseTimelineResponse."""
+    rows = await aiter_query_rows(query_factory)
+    
+    async def items() -> AsyncIterator[Dict[str, Any]]:
+        async for timeline_data in rows:
+            yield _timeline_row_to_dict(timeline_data)
+    
+    return StreamingResponse(aiter_json_array(items()), media_type="application/json")
+
 
 @router.get("/", response_model=list[CaseTimelineResponse])
 async def get_timeline():
     """Get all timeline entries."""
     try:
-        client = supabase_client.get_client()
+        client = supabase_client.get_async_client()
         
-        response = client.table("case_timeline").select("*").order("timeline_info->date->month, timeline_info->date->day, timeline_info->time").execute()
-        
-        timeline_list = []
-        for timeline_data in response.data:
-            timeline_info = timeline_data["timeline_info"]
-            timeline_list.append(CaseTimelineResponse(
-                id=timeline_info["id"],
-                time=timeline_info["time"],
-                duration=timeline_info["duration"],
-                actor=timeline_info["actor"],
-                date=timeline_info["date"],
-                title=timeline_info["title"],
-                type=timeline_info["type"],
-                confidence=timeline_info["confidence"],
-                evidence=timeline_info["evidence"],
-                description=timeline_info["description"]
-            ))
-        
-        return timeline_list
+        return await _stream_timeline(
+            lambda: client.table("case_timeline").select("timeline_info").order(TIMELINE_ORDER).order("id")
+        )
         
     except Exception as e:
         logger.error(f"Error fetching timeline: {e}")
@@ -45,31 +62,18 @@ async def get_timeline():
 async def get_timeline_by_id(timeline_id: str):
     """Get a specific timeline entry by ID."""
     try:
-        client = supabase_client.get_client()
+        client = supabase_client.get_async_client()
         
-        response = client.table("case_timeline").select("*").eq("id", timeline_id).execute()
+        response = await client.table("case_timeline").select("timeline_info").eq("id", timeline_id).maybe_single().execute()
         
-        if not response.data:
+        if response is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Timeline entry not found"
             )
         
-        timeline_data = response.data[0]
-        timeline_info = timeline_data["timeline_info"]
-        
-        return CaseTimelineResponse(
-            id=timeline_info["id"],
-            time=timeline_info["time"],
-            duration=timeline_info["duration"],
-            actor=timeline_info["actor"],
-            date=timeline_info["date"],
-            title=timeline_info["title"],
-            type=timeline_info["type"],
-            confidence=timeline_info["confidence"],
-            evidence=timeline_info["evidence"],
-            description=timeline_info["description"]
-        )
+        timeline_data = response.data
+        return CaseTimelineResponse.model_validate(_timeline_row_to_dict(timeline_data))
         
     except HTTPException:
         raise
@@ -85,27 +89,11 @@ async def get_timeline_by_id(timeline_id: str):
 async def get_timeline_by_case_id(case_id: str):
     """Get all timeline entries for a specific case."""
     try:
-        client = supabase_client.get_client()
-        
-        response = client.table("case_timeline").select("*").eq("case_id", case_id).order("timeline_info->date->month, timeline_info->date->day, timeline_info->time").execute()
+        client = supabase_client.get_async_client()
         
-        timeline_list = []
-        for timeline_data in response.data:
-            timeline_info = timeline_data["timeline_info"]
-            timeline_list.append(CaseTimelineResponse(
-                id=timeline_info["id"],
-                time=timeline_info["time"],
-                duration=timeline_info["duration"],
-                actor=timeline_info["actor"],
-                date=timeline_info["date"],
-                title=timeline_info["title"],
-                type=timeline_info["type"],
-                confidence=timeline_info["confidence"],
-                evidence=timeline_info["evidence"],
-                description=timeline_info["description"]
-            ))
-        
-        return timeline_list
+        return await _stream_timeline(
+            lambda: client.table("case_timeline").select("timeline_info").eq("case_id", case_id).order(TIMELINE_ORDER).order("id")
+        )
         
     except Exception as e:
         logger.error(f"Error fetching timeline for case {case_id}: {e}")
@@ -119,30 +107,27 @@ async def get_timeline_by_case_id(case_id: str):
 async def create_timeline_entry(timeline_create: CaseTimelineCreate):
     """Create new timeline entry."""
     try:
-        client = supabase_client.get_client()
-        
-        # Check if timeline entry with this ID already exists
-        existing_response = client.table("case_timeline").select("id").eq("id", timeline_create.id).execute()
-        if existing_response.data:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Timeline entry with this ID already exists"
-            )
-        
-        # Check if the case exists
-        case_response = client.table("cases").select("id").eq("id", timeline_create.case_id).execute()
-        if not case_response.data:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Case not found"
-            )
-        
-        # Insert new timeline entry
-        response = client.table("case_timeline").insert({
-            "id": str(timeline_create.id),
-            "case_id": timeline_create.case_id,
-            "timeline_info": timeline_create.timeline_info.dict()
-        }).execute()
+        client = supabase_client.get_async_client()
+        
+        # Insert new timeline entry, relying on the primary and foreign keys to reject duplicates and unknown cases
+        try:
+            response = await client.table("case_timeline").insert({
+                "id": str(timeline_create.id),
+                "case_id": timeline_create.case_id,
+                "timeline_info": timeline_create.timeline_info.model_dump(mode="json", exclude_none=True)
+            }).execute()
+        except APIError as e:
+            if e.code == UNIQUE_VIOLATION:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Timeline entry with this ID already exists"
+                )
+            if e.code == FOREIGN_KEY_VIOLATION:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Case not found"
+                )
+            raise
         
         if not response.data:
             raise HTTPException(
@@ -151,20 +136,7 @@ async def create_timeline_entry(timeline_create: CaseTimelineCreate):
             )
         
         timeline_data = response.data[0]
-        timeline_info = timeline_data["timeline_info"]
-        
-        return CaseTimelineResponse(
-            id=timeline_info["id"],
-            time=timeline_info["time"],
-            duration=timeline_info["duration"],
-            actor=timeline_info["actor"],
-            date=timeline_info["date"],
-            title=timeline_info["title"],
-            type=timeline_info["type"],
-            confidence=timeline_info["confidence"],
-            evidence=timeline_info["evidence"],
-            description=timeline_info["description"]
-        )
+        return CaseTimelineResponse.model_validate(_timeline_row_to_dict(timeline_data))
         
     except HTTPException:
         raise
@@ -183,20 +155,12 @@ async def update_timeline_entry(
 ):
     """Update timeline entry."""
     try:
-        client = supabase_client.get_client()
-        
-        # Check if timeline entry exists
-        existing_response = client.table("case_timeline").select("*").eq("id", timeline_id).execute()
-        if not existing_response.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Timeline entry not found"
-            )
+        client = supabase_client.get_async_client()
         
         # Prepare update data
         update_data = {}
         if timeline_update.timeline_info:
-            update_data["timeline_info"] = timeline_update.timeline_info.dict()
+            update_data["timeline_info"] = timeline_update.timeline_info.model_dump(mode="json", exclude_none=True)
         
         if not update_data:
             raise HTTPException(
@@ -204,8 +168,8 @@ async def update_timeline_entry(
                 detail="No fields to update"
             )
         
-        # Update timeline entry
-        response = client.table("case_timeline").update(update_data).eq("id", timeline_id).execute()
+        # Update timeline entry; no returned row means it does not exist
+        response = await client.table("case_timeline").update(update_data).eq("id", timeline_id).execute()
         
         if not response.data:
             raise HTTPException(
@@ -214,20 +178,7 @@ async def update_timeline_entry(
             )
         
         timeline_data = response.data[0]
-        timeline_info = timeline_data["timeline_info"]
-        
-        return CaseTimelineResponse(
-            id=timeline_info["id"],
-            time=timeline_info["time"],
-            duration=timeline_info["duration"],
-            actor=timeline_info["actor"],
-            date=timeline_info["date"],
-            title=timeline_info["title"],
-            type=timeline_info["type"],
-            confidence=timeline_info["confidence"],
-            evidence=timeline_info["evidence"],
-            description=timeline_info["description"]
-        )
+        return CaseTimelineResponse.model_validate(_timeline_row_to_dict(timeline_data))
         
     except HTTPException:
         raise
@@ -243,9 +194,9 @@ async def update_timeline_entry(
 async def delete_timeline_entry(timeline_id: str):
     """Delete timeline entry."""
     try:
-        client = supabase_client.get_client()
+        client = supabase_client.get_async_client()
         
-        response = client.table("case_timeline").delete().eq("id", timeline_id).execute()
+        response = await returning(client.table("case_timeline").delete().eq("id", timeline_id), "id").execute()
         
         if not response.data:
             raise HTTPException(
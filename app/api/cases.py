@@ -1,145 +1,314 @@
-from fastapi import APIRouter, HTTPException, status
-from app.schemas.case import CaseResponse, CaseCreate, CaseUpdate, EvidenceInfo, AudioComparisonInfo
-from app.core.database import supabase_client
+from fastapi import APIRouter, Header, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from postgrest.exceptions import APIError
+from supabase import AsyncClient
+from app.schemas.case import (
+    CaseResponse, CaseCreate, CaseUpdate, EvidenceInfo,
+    AudioComparisonInfo, AudioComparisonWitness, DetailedAnalysis
+)
+from app.core.cache import response_cache, etag_for, etag_matches
+from app.core.database import supabase_client, UNIQUE_VIOLATION, returning
+from app.utils.streaming import NDJSON_MEDIA_TYPE, aiter_json_array, aiter_ndjson, wants_ndjson
+import base64
+import binascii
 import logging
+import orjson
+from collections import defaultdict
+from datetime import datetime
+from operator import itemgetter
+from typing import AsyncIterator, Optional
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Response cache keys: cases:<case_id> for a case, cases:page:<cursor>:<limit> for list pages
+CASE_CACHE_PREFIX = "cases:"
+CASE_PAGE_CACHE_PREFIX = "cases:page:"
+CASE_PAGE_SIZE = 100
+MAX_CASE_PAGE_SIZE = 500
 
-async def get_evidence_for_case(case_id: str) -> list[EvidenceInfo]:
-    """Get evidence information for a specific case, merged with media data."""
+# Columns read when building CaseResponse and its nested lists
+CASE_COLUMNS = "id,case_info,created_at,updated_at"
+EVIDENCE_COLUMNS = "id,case_id,evidence_info,created_at,updated_at"
+COMPARISON_COLUMNS = "id,case_id,media_id1,media_id2,witnesses,detailed_analysis,created_at,updated_at"
+CASE_PAGE_COLUMNS = f"{CASE_COLUMNS},evidence({EVIDENCE_COLUMNS}),case_audio_comparison({COMPARISON_COLUMNS})"
+
+# Required JSON keys copied straight from case_info / evidence_info, fetched with a single C call per row
+CASE_INFO_FIELDS = (
+    "firNumber", "title", "summary", "petitioner", "accused",
+    "investigatingOfficer", "registeredDate", "status", "visibility", "location"
+)
+EVIDENCE_INFO_FIELDS = ("name", "description", "uploadDate", "fileSize", "tags")
+_get_case_info_fields = itemgetter(*CASE_INFO_FIELDS)
+_get_evidence_info_fields = itemgetter(*EVIDENCE_INFO_FIELDS)
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse a PostgREST timestamp string, passing through missing values."""
+    return datetime.fromisoformat(value) if value else None
+
+
+def _to_case_response(
+    case_data: dict,
+    evidence: Optional[list[EvidenceInfo]] = None,
+    audio_comparisons: Optional[list[AudioComparisonInfo]] = None
+) -> CaseResponse:
+    """
+    Build a CaseResponse from a cases row without re-validating it.
+    
+    Rows come from our own table and were validated on write, so
+    model_construct is used to skip per-field validation.
+    """
+    fields = dict(zip(CASE_INFO_FIELDS, _get_case_info_fields(case_data["case_info"])))
+    fields["id"] = case_data["id"]
+    fields["created_at"] = _parse_timestamp(case_data.get("created_at"))
+    fields["updated_at"] = _parse_timestamp(case_data.get("updated_at"))
+    if evidence is not None:
+        fields["evidence"] = evidence
+    if audio_comparisons is not None:
+        fields["audioComparisons"] = audio_comparisons
+    return CaseResponse.model_construct(**fields)
+
+
+def _build_evidence(evidence_data: dict, matching_media: Optional[dict]) -> EvidenceInfo:
+    """Build an EvidenceInfo from an evidence row and its matching media, if any."""
+    evidence_info = evidence_data["evidence_info"]
+    evidence_type = evidence_info["type"]
+    
+    processing_status = "processed" if evidence_type in ["audio", "video"] else "pending"
+    
+    return EvidenceInfo.model_construct(
+        id=evidence_data["id"],
+        caseId=evidence_data["case_id"],
+        type=evidence_type,
+        **dict(zip(EVIDENCE_INFO_FIELDS, _get_evidence_info_fields(evidence_info))),
+        duration=evidence_info.get("duration") or (matching_media.get("duration") if matching_media else None),
+        thumbnail=evidence_info.get("thumbnail"),
+        url=matching_media.get("url") if matching_media else None,
+        transcript=matching_media.get("transcript") if matching_media else None,
+        processingStatus=processing_status,
+        created_at=_parse_timestamp(evidence_data.get("created_at")),
+        updated_at=_parse_timestamp(evidence_data.get("updated_at"))
+    )
+
+
+def _build_evidence_list(evidence_rows: list[dict], media_rows: list[dict]) -> list[EvidenceInfo]:
+    """Merge evidence rows for one case with the latest media row of each type."""
+    # Create a mapping of media by type for matching
+    media_by_type = {}
+    for media_data in media_rows:
+        media_by_type.setdefault(media_data.get("type") or "unknown", media_data)
+    
+    return [
+        _build_evidence(evidence_data, media_by_type.get(evidence_data["evidence_info"]["type"]))
+        for evidence_data in evidence_rows
+    ]
+
+
+def _build_audio_comparison(comparison_data: dict) -> AudioComparisonInfo:
+    """Build an AudioComparisonInfo from a case_audio_comparison row."""
+    # Transform witnesses to use ev1/ev2 instead of UUIDs
+    witnesses = comparison_data["witnesses"]
+    for witness in witnesses:
+        if witness.get("audioId") == comparison_data["media_id1"]:
+            witness["audioId"] = "ev1"
+        elif witness.get("audioId") == comparison_data["media_id2"]:
+            witness["audioId"] = "ev2"
+    
+    return AudioComparisonInfo.model_construct(
+        id=comparison_data["id"],
+        caseId=comparison_data["case_id"],
+        mediaId1=comparison_data["media_id1"],
+        mediaId2=comparison_data["media_id2"],
+        witnesses=[AudioComparisonWitness.model_construct(**witness) for witness in witnesses],
+        detailedAnalysis=[DetailedAnalysis.model_construct(**item) for item in comparison_data["detailed_analysis"]],
+        created_at=_parse_timestamp(comparison_data.get("created_at")),
+        updated_at=_parse_timestamp(comparison_data.get("updated_at"))
+    )
+
+
+async def get_latest_media_bulk(client: AsyncClient, case_ids: list[str]) -> dict[str, list[dict]]:
+    """Get the latest media record of each type for several cases with a single call."""
     try:
-        client = supabase_client.get_client()
-        
-        # Fetch evidence data
-        evidence_response = client.table("evidence").select("*").eq("case_id", case_id).order("created_at", desc=True).execute()
+        response = await client.rpc("media_latest_per_type", {"p_case_ids": case_ids}).execute()
         
-        # Fetch media data
-        media_response = client.table("media").select("*").eq("case_id", case_id).order("created_at", desc=True).execute()
+        media_by_case = defaultdict(list)
+        for media_data in response.data:
+            media_by_case[media_data["case_id"]].append(media_data)
         
-        # Create a mapping of media by type for matching
-        media_by_type = {}
-        for media_data in media_response.data:
-            media_info = media_data["media_info"]
-            media_type = media_info.get("type", "unknown")
-            if media_type not in media_by_type:
-                media_by_type[media_type] = []
-            media_by_type[media_type].append({
-                "url": media_info.get("url"),
-                "transcript": media_info.get("transcript"),
-                "duration": media_info.get("duration")
-            })
+        return media_by_case
         
-        evidence_list = []
-        for evidence_data in evidence_response.data:
-            evidence_info = evidence_data["evidence_info"]
-            evidence_type = evidence_info["type"]
-            
-            matching_media = None
-            if evidence_type in media_by_type and media_by_type[evidence_type]:
-                matching_media = media_by_type[evidence_type][0]
-            
-            processing_status = "processed" if evidence_type in ["audio", "video"] else "pending"
-            
-            evidence_list.append(EvidenceInfo(
-                id=evidence_data["id"],
-                caseId=evidence_data["case_id"],
-                type=evidence_type,
-                name=evidence_info["name"],
-                description=evidence_info["description"],
-                uploadDate=evidence_info["uploadDate"],
-                fileSize=evidence_info["fileSize"],
-                tags=evidence_info["tags"],
-                duration=evidence_info.get("duration") or (matching_media.get("duration") if matching_media else None),
-                thumbnail=evidence_info.get("thumbnail"),
-                url=matching_media.get("url") if matching_media else None,
-                transcript=matching_media.get("transcript") if matching_media else None,
-                processingStatus=processing_status,
-                created_at=evidence_data.get("created_at"),
-                updated_at=evidence_data.get("updated_at")
-            ))
-        
-        return evidence_list
-        
-    except Exception as e:
-        logger.error(f"Error fetching evidence for case {case_id}: {e}")
-        return []
+    except Exception:
+        logger.exception("Error fetching media for cases")
+        return {}
+
+
+async def invalidate_case_cache(*case_ids: str) -> None:
+    """
+    Drop cached entries affected by a write to the given cases.
+    
+    Case responses embed evidence, media and audio comparisons, so writes to
+    those tables must call this for the owning case as well.
+    """
+    if case_ids:
+        await response_cache.delete(*(f"{CASE_CACHE_PREFIX}{case_id}" for case_id in case_ids))
+    # Any cached page of the case list may contain the case
+    await response_cache.delete_prefix(CASE_PAGE_CACHE_PREFIX)
 
 
-async def get_audio_comparisons_for_case(case_id: str) -> list[AudioComparisonInfo]:
-    """Get audio comparison information for a specific case."""
+def _encode_cursor(created_at: str, case_id: str) -> str:
+    """Encode the (created_at, id) of the last case on a page as an opaque, URL-safe cursor."""
+    return base64.urlsafe_b64encode(orjson.dumps([created_at, case_id])).rstrip(b"=").decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[str, str]:
+    """Decode a cursor from `_encode_cursor`, raising ValueError if it is malformed."""
     try:
-        client = supabase_client.get_client()
-        
-        response = client.table("case_audio_comparison").select("*").eq("case_id", case_id).order("created_at", desc=True).execute()
-        
-        comparisons_list = []
-        for comparison_data in response.data:
-            # Transform witnesses to use ev1/ev2 instead of UUIDs
-            witnesses = comparison_data["witnesses"]
-            for witness in witnesses:
-                if witness.get("audioId") == comparison_data["media_id1"]:
-                    witness["audioId"] = "ev1"
-                elif witness.get("audioId") == comparison_data["media_id2"]:
-                    witness["audioId"] = "ev2"
-            
-            comparisons_list.append(AudioComparisonInfo(
-                id=comparison_data["id"],
-                caseId=comparison_data["case_id"],
-                mediaId1=comparison_data["media_id1"],
-                mediaId2=comparison_data["media_id2"],
-                witnesses=witnesses,
-                detailedAnalysis=comparison_data["detailed_analysis"],
-                created_at=comparison_data.get("created_at"),
-                updated_at=comparison_data.get("updated_at")
-            ))
-        
-        return comparisons_list
-        
-    except Exception as e:
-        logger.error(f"Error fetching audio comparisons for case {case_id}: {e}")
-        return []
+        created_at, case_id = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return datetime.fromisoformat(created_at).isoformat(), str(case_id)
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+def _quote_filter_value(value: str) -> str:
+    """Double-quote a value for use inside a PostgREST or=(...) filter."""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+async def _load_case_page(cursor: Optional[str], limit: int) -> list[dict]:
+    """
+    Load one page of cases with their evidence and audio comparisons as JSON-ready dicts.
+    
+    Pages are ordered by (created_at desc, id), so `cursor` encodes both values
+    of the last case on the previous page; cases sharing its created_at are
+    not skipped.
+    """
+    client = supabase_client.get_async_client()
+    
+    # Evidence and audio comparisons are embedded through their case_id foreign keys
+    query = (
+        client.table("cases")
+        .select(CASE_PAGE_COLUMNS)
+        .order("created_at", desc=True)
+        .order("id")
+        .limit(limit)
+    )
+    # postgrest-py's foreign_table ordering targets to-one embeds, so order the child lists directly
+    for embedded_table in ("evidence", "case_audio_comparison"):
+        query.params = query.params.add(f"{embedded_table}.order", "created_at.desc")
+    if cursor:
+        created_at, case_id = (_quote_filter_value(value) for value in _decode_cursor(cursor))
+        query = query.or_(f"created_at.lt.{created_at},and(created_at.eq.{created_at},id.gt.{case_id})")
+    response = await query.execute()
+    
+    # Latest media per type can't be expressed as an embed, so it is fetched for the whole page at once
+    case_ids = [case_data["id"] for case_data in response.data]
+    media_by_case = await get_latest_media_bulk(client, case_ids) if case_ids else {}
+    
+    cases = []
+    for case_data in response.data:
+        evidence = _build_evidence_list(case_data["evidence"], media_by_case.get(case_data["id"], []))
+        audio_comparisons = [_build_audio_comparison(comparison_data) for comparison_data in case_data["case_audio_comparison"]]
+        
+        cases.append(_to_case_response(case_data, evidence, audio_comparisons).model_dump(mode="json"))
+    
+    return cases
+
+
+async def _get_cached_case_page(cursor: Optional[str], limit: int) -> list[dict]:
+    """Load a page of the case list through the response cache."""
+    async def load() -> bytes:
+        return orjson.dumps(await _load_case_page(cursor, limit))
+    
+    page = await response_cache.get_or_load(f"{CASE_PAGE_CACHE_PREFIX}{cursor}:{limit}", load)
+    return orjson.loads(page)
+
+
+def _next_cursor(page: list[dict], limit: int) -> Optional[str]:
+    """Return the cursor for the page after `page`, or None if it was the last one."""
+    if len(page) < limit:
+        return None
+    return _encode_cursor(page[-1]["created_at"], page[-1]["id"])
+
+
+async def _iter_cases(first_page: list[dict]) -> AsyncIterator[dict]:
+    """Yield cases page by page, starting from an already loaded first page."""
+    page = first_page
+    while True:
+        for case in page:
+            yield case
+        cursor = _next_cursor(page, CASE_PAGE_SIZE)
+        if cursor is None:
+            return
+        page = await _get_cached_case_page(cursor, CASE_PAGE_SIZE)
+
+
+async def _load_case(case_id: str) -> CaseResponse:
+    """Load a single case with its evidence and audio comparisons."""
+    client = supabase_client.get_async_client()
+    
+    # The case, its evidence (with merged media data) and audio comparisons in one round-trip
+    response = await client.rpc("get_case_full", {"p_id": case_id}).execute()
+    
+    if not response.data:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Case not found"
+        )
+    
+    case_full = response.data
+    evidence = [_build_evidence(evidence_data, evidence_data.get("media")) for evidence_data in case_full["evidence"]]
+    audio_comparisons = [_build_audio_comparison(comparison_data) for comparison_data in case_full["comparisons"]]
+    
+    return _to_case_response(case_full["case"], evidence, audio_comparisons)
 
 
 @router.get("/", response_model=list[CaseResponse])
-async def get_cases():
-    """Get all cases."""
+async def get_cases(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_CASE_PAGE_SIZE, description="Maximum number of cases to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's X-Next-Cursor header"),
+    accept: Optional[str] = Header(None)
+):
+    """
+    Get cases, newest first.
+    
+    With `limit`, a single page is returned and the cursor for the next page is
+    sent in the `X-Next-Cursor` header. Without it, all cases are streamed.
+    Clients sending `Accept: application/x-ndjson` get one case per line
+    instead of a JSON array.
+    """
+    if cursor:
+        try:
+            _decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+    
     try:
-        client = supabase_client.get_client()
-        
-        response = client.table("cases").select("*").execute()
-        
-        cases = []
-        for case_data in response.data:
-            case_info = case_data["case_info"]
-            
-            # Get evidence (with merged media data) and audio comparisons for this case
-            evidence = await get_evidence_for_case(case_data["id"])
-            audio_comparisons = await get_audio_comparisons_for_case(case_data["id"])
-            
-            cases.append(CaseResponse(
-                id=case_data["id"],
-                firNumber=case_info["firNumber"],
-                title=case_info["title"],
-                summary=case_info["summary"],
-                petitioner=case_info["petitioner"],
-                accused=case_info["accused"],
-                investigatingOfficer=case_info["investigatingOfficer"],
-                registeredDate=case_info["registeredDate"],
-                status=case_info["status"],
-                visibility=case_info["visibility"],
-                location=case_info["location"],
-                evidence=evidence,
-                audioComparisons=audio_comparisons,
-                created_at=case_data.get("created_at"),
-                updated_at=case_data.get("updated_at")
-            ))
-        
-        return cases
+        # Load the first page eagerly so that query errors still map to a 500
+        first_page = await _get_cached_case_page(cursor, limit or CASE_PAGE_SIZE)
+        
+        # Responses are returned directly, bypassing FastAPI's validation pass over the list
+        if limit:
+            next_cursor = _next_cursor(first_page, limit)
+            headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+            if wants_ndjson(accept):
+                content = b"".join(orjson.dumps(case, option=orjson.OPT_APPEND_NEWLINE) for case in first_page)
+                return Response(content=content, media_type=NDJSON_MEDIA_TYPE, headers=headers)
+            return ORJSONResponse(first_page, headers=headers)
+        
+        if wants_ndjson(accept):
+            return StreamingResponse(aiter_ndjson(_iter_cases(first_page)), media_type=NDJSON_MEDIA_TYPE)
+        
+        return StreamingResponse(
+            aiter_json_array(_iter_cases(first_page)),
+            media_type="application/json"
+        )
         
-    except Exception as e:
-        logger.error(f"Error fetching cases: {e}")
+    except Exception:
+        logger.exception("Error fetching cases")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch cases"
@@ -147,48 +316,29 @@ async def get_cases():
 
 
 @router.get("/{case_id}", response_model=CaseResponse)
-async def get_case_by_id(case_id: str):
-    """Get a specific case by ID."""
+async def get_case_by_id(case_id: str, if_none_match: Optional[str] = Header(None)):
+    """
+    Get a specific case by ID.
+    
+    The response carries an ETag over the whole body (case, evidence and
+    comparisons); a matching If-None-Match gets a 304 with no body.
+    """
     try:
-        client = supabase_client.get_client()
-        
-        response = client.table("cases").select("*").eq("id", case_id).execute()
-        
-        if not response.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Case not found"
-            )
+        async def load() -> bytes:
+            return orjson.dumps((await _load_case(case_id)).model_dump(mode="json"))
         
-        case_data = response.data[0]
-        case_info = case_data["case_info"]
+        # Cached bytes are returned as-is, skipping response_model serialization
+        content = await response_cache.get_or_load(f"{CASE_CACHE_PREFIX}{case_id}", load)
         
-        # Get evidence (with merged media data) and audio comparisons for this case
-        evidence = await get_evidence_for_case(case_data["id"])
-        audio_comparisons = await get_audio_comparisons_for_case(case_data["id"])
-        
-        return CaseResponse(
-            id=case_data["id"],
-            firNumber=case_info["firNumber"],
-            title=case_info["title"],
-            summary=case_info["summary"],
-            petitioner=case_info["petitioner"],
-            accused=case_info["accused"],
-            investigatingOfficer=case_info["investigatingOfficer"],
-            registeredDate=case_info["registeredDate"],
-            status=case_info["status"],
-            visibility=case_info["visibility"],
-            location=case_info["location"],
-            evidence=evidence,
-            audioComparisons=audio_comparisons,
-            created_at=case_data.get("created_at"),
-            updated_at=case_data.get("updated_at")
-        )
+        headers = {"ETag": etag_for(content)}
+        if etag_matches(headers["ETag"], if_none_match):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=content, media_type="application/json", headers=headers)
         
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Error fetching case {case_id}: {e}")
+    except Exception:
+        logger.exception("Error fetching case %s", case_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch case"
@@ -199,21 +349,21 @@ async def get_case_by_id(case_id: str):
 async def create_case(case_create: CaseCreate):
     """Create a new case."""
     try:
-        client = supabase_client.get_client()
-        
-        # Check if case with this ID already exists
-        existing_response = client.table("cases").select("id").eq("id", case_create.id).execute()
-        if existing_response.data:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Case with this ID already exists"
-            )
-        
-        # Insert new case
-        response = client.table("cases").insert({
-            "id": case_create.id,
-            "case_info": case_create.case_info.dict()
-        }).execute()
+        client = supabase_client.get_async_client()
+        
+        # Insert new case, relying on the primary key to reject duplicates
+        try:
+            response = await client.table("cases").insert({
+                "id": case_create.id,
+                "case_info": case_create.case_info.model_dump(mode="json")
+            }).execute()
+        except APIError as e:
+            if e.code == UNIQUE_VIOLATION:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Case with this ID already exists"
+                )
+            raise
         
         if not response.data:
             raise HTTPException(
@@ -222,28 +372,15 @@ async def create_case(case_create: CaseCreate):
             )
         
         case_data = response.data[0]
-        case_info = case_data["case_info"]
+        await invalidate_case_cache(case_data["id"])
         
-        return CaseResponse(
-            id=case_data["id"],
-            firNumber=case_info["firNumber"],
-            title=case_info["title"],
-            summary=case_info["summary"],
-            petitioner=case_info["petitioner"],
-            accused=case_info["accused"],
-            investigatingOfficer=case_info["investigatingOfficer"],
-            registeredDate=case_info["registeredDate"],
-            status=case_info["status"],
-            visibility=case_info["visibility"],
-            location=case_info["location"],
-            created_at=case_data.get("created_at"),
-            updated_at=case_data.get("updated_at")
-        )
+        # Returned pre-serialized so FastAPI does not re-validate the constructed model
+        return ORJSONResponse(_to_case_response(case_data).model_dump(mode="json"))
         
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Error creating case: {e}")
+    except Exception:
+        logger.exception("Error creating case")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create case"
@@ -257,29 +394,21 @@ async def update_case(
 ):
     """Update a case."""
     try:
-        client = supabase_client.get_client()
-        
-        # Check if case exists
-        existing_response = client.table("cases").select("*").eq("id", case_id).execute()
-        if not existing_response.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Case not found"
-            )
+        client = supabase_client.get_async_client()
         
-        # Prepare update data
-        update_data = {}
+        # Only send the case_info keys the client actually set
+        patch = {}
         if case_update.case_info:
-            update_data["case_info"] = case_update.case_info.dict()
+            patch = case_update.case_info.model_dump(mode="json", exclude_unset=True, exclude_none=True)
         
-        if not update_data:
+        if not patch:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="No fields to update"
             )
         
-        # Update case
-        response = client.table("cases").update(update_data).eq("id", case_id).execute()
+        # Merge the patch into case_info server-side; no returned row means the case does not exist
+        response = await client.rpc("update_case_info", {"p_id": case_id, "p_patch": patch}).execute()
         
         if not response.data:
             raise HTTPException(
@@ -288,28 +417,15 @@ async def update_case(
             )
         
         case_data = response.data[0]
-        case_info = case_data["case_info"]
+        await invalidate_case_cache(case_data["id"])
         
-        return CaseResponse(
-            id=case_data["id"],
-            firNumber=case_info["firNumber"],
-            title=case_info["title"],
-            summary=case_info["summary"],
-            petitioner=case_info["petitioner"],
-            accused=case_info["accused"],
-            investigatingOfficer=case_info["investigatingOfficer"],
-            registeredDate=case_info["registeredDate"],
-            status=case_info["status"],
-            visibility=case_info["visibility"],
-            location=case_info["location"],
-            created_at=case_data.get("created_at"),
-            updated_at=case_data.get("updated_at")
-        )
+        # Returned pre-serialized so FastAPI does not re-validate the constructed model
+        return ORJSONResponse(_to_case_response(case_data).model_dump(mode="json"))
         
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Error updating case {case_id}: {e}")
+    except Exception:
+        logger.exception("Error updating case %s", case_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update case"
@@ -320,9 +436,9 @@ async def update_case(
 async def delete_case(case_id: str):
     """Delete a case."""
     try:
-        client = supabase_client.get_client()
+        client = supabase_client.get_async_client()
         
-        response = client.table("cases").delete().eq("id", case_id).execute()
+        response = await returning(client.table("cases").delete().eq("id", case_id), "id").execute()
         
         if not response.data:
             raise HTTPException(
@@ -330,12 +446,21 @@ async def delete_case(case_id: str):
                 detail="Case not found"
             )
         
+        await invalidate_case_cache(case_id)
+        # The case's evidence and media rows are removed by FK cascade, but stay in
+        # the cached lists and media lookups; their keys are not all scoped by case.
+        # Imported here because both modules import invalidate_case_cache from this one.
+        from app.api.evidence import EVIDENCE_CACHE_PREFIX
+        from app.api.media import MEDIA_CACHE_PREFIX
+        await response_cache.delete_prefix(EVIDENCE_CACHE_PREFIX)
+        await response_cache.delete_prefix(MEDIA_CACHE_PREFIX)
+        
         return {"message": "Case deleted successfully"}
         
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Error deleting case {case_id}: {e}")
+    except Exception:
+        logger.exception("Error deleting case %s", case_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to delete case"
@@ -1,39 +1,114 @@
-from fastapi import APIRouter, HTTPException, status
-from app.schemas.evidence import EvidenceResponse, EvidenceCreate, EvidenceUpdate
-from app.core.database import supabase_client
+from fastapi import APIRouter, HTTPException, status, Query
+from fastapi.responses import Response
+from app.schemas.evidence import EvidenceResponse, EvidenceListResponse, EvidenceCreate, EvidenceUpdate
+from postgrest.exceptions import APIError
+from pydantic import TypeAdapter
+from typing import Optional
+from datetime import datetime
+from app.core.cache import response_cache, cached_json_response
+from app.core.database import supabase_client, UNIQUE_VIOLATION, FOREIGN_KEY_VIOLATION, returning
+from app.api.cases import invalidate_case_cache
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+EVIDENCE_COLUMNS = "id,case_id,evidence_info,created_at,updated_at"
 
-@router.get("/", response_model=list[EvidenceResponse])
-async def get_evidence():
-    """Get all evidence."""
+# Response cache keys: evidence:all:<page>:<per_page> and evidence:case:<case_id>:<page>:<per_page>
+EVIDENCE_CACHE_PREFIX = "evidence:"
+
+# Page size bounds for the list endpoints
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Upper bound on rows accepted by the bulk create endpoint
+MAX_BULK_CREATE = 500
+
+# EvidenceResponse fields a row must carry to skip validation
+EVIDENCE_REQUIRED_FIELDS = frozenset(
+    name for name, field in EvidenceResponse.model_fields.items() if field.is_required()
+)
+
+# Serialize evidence straight to JSON bytes in single calls into pydantic-core
+_evidence_adapter = TypeAdapter(EvidenceResponse)
+_evidence_list_adapter = TypeAdapter(list[EvidenceResponse])
+_evidence_page_adapter = TypeAdapter(EvidenceListResponse)
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse a PostgREST timestamp string, passing through missing values."""
+    return datetime.fromisoformat(value) if value else None
+
+
+def _evidence_row(evidence_data: dict) -> dict:
+    """Flatten an evidence row into the EvidenceResponse field names."""
+    return {
+        **evidence_data["evidence_info"],
+        "id": evidence_data["id"],
+        "caseId": evidence_data["case_id"],
+        "created_at": _parse_timestamp(evidence_data.get("created_at")),
+        "updated_at": _parse_timestamp(evidence_data.get("updated_at"))
+    }
+
+
+def _to_evidence_response(evidence_data: dict) -> EvidenceResponse:
+    """
+    Build an EvidenceResponse for list responses, skipping validation where it is safe.
+    
+    evidence_info is not guaranteed to match EvidenceInfo: partial updates
+    merge raw JSON server-side and older rows predate the schema. Rows that
+    have every required field are built with model_construct; any other row
+    is validated, so a missing field raises instead of silently vanishing
+    from the response.
+    """
+    row = _evidence_row(evidence_data)
+    if EVIDENCE_REQUIRED_FIELDS.issubset(row):
+        return EvidenceResponse.model_construct(**row)
+    return EvidenceResponse.model_validate(row)
+
+
+def _evidence_json_response(evidence_data: dict) -> Response:
+    """
+    Validate one evidence row and return it as JSON bytes.
+    
+    Returning a Response skips FastAPI's response_model pass, which would
+    dump and re-validate the model a second time.
+    """
+    evidence = _evidence_adapter.validate_python(_evidence_row(evidence_data))
+    return Response(content=_evidence_adapter.dump_json(evidence), media_type="application/json")
+
+
+async def _load_evidence_page(page: int, per_page: int, case_id: Optional[str] = None) -> bytes:
+    """Fetch one page of evidence (newest first) with its total count, as EvidenceListResponse JSON."""
+    client = supabase_client.get_async_client()
+    offset = (page - 1) * per_page
+    
+    query = client.table("evidence").select(EVIDENCE_COLUMNS, count="exact")
+    if case_id is not None:
+        query = query.eq("case_id", case_id)
+    response = await query.order("created_at", desc=True).range(offset, offset + per_page - 1).execute()
+    
+    return _evidence_page_adapter.dump_json(EvidenceListResponse.model_construct(
+        evidence=[_to_evidence_response(evidence_data) for evidence_data in response.data],
+        total=response.count or 0,
+        page=page,
+        per_page=per_page
+    ))
+
+
+@router.get("/", response_model=EvidenceListResponse)
+async def get_evidence(
+    page: int = Query(1, ge=1),
+    per_page: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+):
+    """Get evidence with pagination."""
     try:
-        client = supabase_client.get_client()
-        
-        response = client.table("evidence").select("*").execute()
-        
-        evidence_list = []
-        for evidence_data in response.data:
-            evidence_info = evidence_data["evidence_info"]
-            evidence_list.append(EvidenceResponse(
-                id=evidence_data["id"],
-                caseId=evidence_data["case_id"],
-                type=evidence_info["type"],
-                name=evidence_info["name"],
-                description=evidence_info["description"],
-                uploadDate=evidence_info["uploadDate"],
-                fileSize=evidence_info["fileSize"],
-                tags=evidence_info["tags"],
-                duration=evidence_info.get("duration"),
-                thumbnail=evidence_info.get("thumbnail"),
-                created_at=evidence_data.get("created_at"),
-                updated_at=evidence_data.get("updated_at")
-            ))
-        
-        return evidence_list
+        content, cache_state = await response_cache.lookup(
+            f"{EVIDENCE_CACHE_PREFIX}all:{page}:{per_page}",
+            lambda: _load_evidence_page(page, per_page)
+        )
+        return cached_json_response(content, cache_state)
         
     except Exception as e:
         logger.error(f"Error fetching evidence: {e}")
@@ -47,33 +122,18 @@ async def get_evidence():
 async def get_evidence_by_id(evidence_id: str):
     """Get a specific evidence by ID."""
     try:
-        client = supabase_client.get_client()
+        client = supabase_client.get_async_client()
         
-        response = client.table("evidence").select("*").eq("id", evidence_id).execute()
+        response = await client.table("evidence").select(EVIDENCE_COLUMNS).eq("id", evidence_id).maybe_single().execute()
         
-        if not response.data:
+        if response is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Evidence not found"
             )
         
-        evidence_data = response.data[0]
-        evidence_info = evidence_data["evidence_info"]
-        
-        return EvidenceResponse(
-            id=evidence_data["id"],
-            caseId=evidence_data["case_id"],
-            type=evidence_info["type"],
-            name=evidence_info["name"],
-            description=evidence_info["description"],
-            uploadDate=evidence_info["uploadDate"],
-            fileSize=evidence_info["fileSize"],
-            tags=evidence_info["tags"],
-            duration=evidence_info.get("duration"),
-            thumbnail=evidence_info.get("thumbnail"),
-            created_at=evidence_data.get("created_at"),
-            updated_at=evidence_data.get("updated_at")
-        )
+        evidence_data = response.data
+        return _evidence_json_response(evidence_data)
         
     except HTTPException:
         raise
@@ -85,33 +145,19 @@ async def get_evidence_by_id(evidence_id: str):
         )
 
 
-@router.get("/case/{case_id}", response_model=list[EvidenceResponse])
-async def get_evidence_by_case_id(case_id: str):
-    """Get all evidence for a specific case."""
+@router.get("/case/{case_id}", response_model=EvidenceListResponse)
+async def get_evidence_by_case_id(
+    case_id: str,
+    page: int = Query(1, ge=1),
+    per_page: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+):
+    """Get evidence for a specific case with pagination."""
     try:
-        client = supabase_client.get_client()
-        
-        response = client.table("evidence").select("*").eq("case_id", case_id).execute()
-        
-        evidence_list = []
-        for evidence_data in response.data:
-            evidence_info = evidence_data["evidence_info"]
-            evidence_list.append(EvidenceResponse(
-                id=evidence_data["id"],
-                caseId=evidence_data["case_id"],
-                type=evidence_info["type"],
-                name=evidence_info["name"],
-                description=evidence_info["description"],
-                uploadDate=evidence_info["uploadDate"],
-                fileSize=evidence_info["fileSize"],
-                tags=evidence_info["tags"],
-                duration=evidence_info.get("duration"),
-                thumbnail=evidence_info.get("thumbnail"),
-                created_at=evidence_data.get("created_at"),
-                updated_at=evidence_data.get("updated_at")
-            ))
-        
-        return evidence_list
+        content, cache_state = await response_cache.lookup(
+            f"{EVIDENCE_CACHE_PREFIX}case:{case_id}:{page}:{per_page}",
+            lambda: _load_evidence_page(page, per_page, case_id)
+        )
+        return cached_json_response(content, cache_state)
         
     except Exception as e:
         logger.error(f"Error fetching evidence for case {case_id}: {e}")
@@ -125,30 +171,27 @@ async def get_evidence_by_case_id(case_id: str):
 async def create_evidence(evidence_create: EvidenceCreate):
     """Create new evidence."""
     try:
-        client = supabase_client.get_client()
-        
-        # Check if evidence with this ID already exists
-        existing_response = client.table("evidence").select("id").eq("id", evidence_create.id).execute()
-        if existing_response.data:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Evidence with this ID already exists"
-            )
-        
-        # Check if the case exists
-        case_response = client.table("cases").select("id").eq("id", evidence_create.case_id).execute()
-        if not case_response.data:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Case not found"
-            )
-        
-        # Insert new evidence
-        response = client.table("evidence").insert({
-            "id": evidence_create.id,
-            "case_id": evidence_create.case_id,
-            "evidence_info": evidence_create.evidence_info.dict()
-        }).execute()
+        client = supabase_client.get_async_client()
+        
+        # Insert new evidence, relying on the primary and foreign keys to reject duplicates and unknown cases
+        try:
+            response = await client.table("evidence").insert({
+                "id": evidence_create.id,
+                "case_id": evidence_create.case_id,
+                "evidence_info": evidence_create.evidence_info.model_dump(mode="json")
+            }).execute()
+        except APIError as e:
+            if e.code == UNIQUE_VIOLATION:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Evidence with this ID already exists"
+                )
+            if e.code == FOREIGN_KEY_VIOLATION:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Case not found"
+                )
+            raise
         
         if not response.data:
             raise HTTPException(
@@ -157,27 +200,69 @@ async def create_evidence(evidence_create: EvidenceCreate):
             )
         
         evidence_data = response.data[0]
-        evidence_info = evidence_data["evidence_info"]
+        await response_cache.delete_prefix(EVIDENCE_CACHE_PREFIX)
+        await invalidate_case_cache(evidence_data["case_id"])
+        return _evidence_json_response(evidence_data)
         
-        return EvidenceResponse(
-            id=evidence_data["id"],
-            caseId=evidence_data["case_id"],
-            type=evidence_info["type"],
-            name=evidence_info["name"],
-            description=evidence_info["description"],
-            uploadDate=evidence_info["uploadDate"],
-            fileSize=evidence_info["fileSize"],
-            tags=evidence_info["tags"],
-            duration=evidence_info.get("duration"),
-            thumbnail=evidence_info.get("thumbnail"),
-            created_at=evidence_data.get("created_at"),
-            updated_at=evidence_data.get("updated_at")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error creating evidence: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create evidence"
         )
+
+
+@router.post("/bulk", response_model=list[EvidenceResponse])
+async def create_evidence_bulk(evidence_creates: list[EvidenceCreate]):
+    """Create several evidence records in a single insert; either all are created or none."""
+    if not evidence_creates:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No evidence to create"
+        )
+    if len(evidence_creates) > MAX_BULK_CREATE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BULK_CREATE} evidence records can be created at once"
+        )
+    
+    try:
+        client = supabase_client.get_async_client()
+        
+        # One multi-row INSERT; the primary and foreign keys reject duplicates and unknown cases
+        try:
+            response = await client.table("evidence").insert([
+                {
+                    "id": evidence_create.id,
+                    "case_id": evidence_create.case_id,
+                    "evidence_info": evidence_create.evidence_info.model_dump(mode="json")
+                }
+                for evidence_create in evidence_creates
+            ]).execute()
+        except APIError as e:
+            if e.code == UNIQUE_VIOLATION:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Evidence with one of these IDs already exists"
+                )
+            if e.code == FOREIGN_KEY_VIOLATION:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Case not found"
+                )
+            raise
+        
+        await response_cache.delete_prefix(EVIDENCE_CACHE_PREFIX)
+        await invalidate_case_cache(*{evidence_data["case_id"] for evidence_data in response.data})
+        evidence = [_to_evidence_response(evidence_data) for evidence_data in response.data]
+        return Response(content=_evidence_list_adapter.dump_json(evidence), media_type="application/json")
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error creating evidence: {e}")
+        logger.error(f"Error creating evidence in bulk: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create evidence"
@@ -191,29 +276,21 @@ async def update_evidence(
 ):
     """Update evidence."""
     try:
-        client = supabase_client.get_client()
+        client = supabase_client.get_async_client()
         
-        # Check if evidence exists
-        existing_response = client.table("evidence").select("*").eq("id", evidence_id).execute()
-        if not existing_response.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Evidence not found"
-            )
-        
-        # Prepare update data
-        update_data = {}
+        # Only send the evidence_info keys the client actually set
+        patch = {}
         if evidence_update.evidence_info:
-            update_data["evidence_info"] = evidence_update.evidence_info.dict()
+            patch = evidence_update.evidence_info.model_dump(mode="json", exclude_unset=True, exclude_none=True)
         
-        if not update_data:
+        if not patch:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="No fields to update"
             )
         
-        # Update evidence
-        response = client.table("evidence").update(update_data).eq("id", evidence_id).execute()
+        # Merge the patch into evidence_info server-side; no returned row means the evidence does not exist
+        response = await client.rpc("update_evidence_info", {"p_id": evidence_id, "p_patch": patch}).execute()
         
         if not response.data:
             raise HTTPException(
@@ -222,22 +299,9 @@ async def update_evidence(
             )
         
         evidence_data = response.data[0]
-        evidence_info = evidence_data["evidence_info"]
-        
-        return EvidenceResponse(
-            id=evidence_data["id"],
-            caseId=evidence_data["case_id"],
-            type=evidence_info["type"],
-            name=evidence_info["name"],
-            description=evidence_info["description"],
-            uploadDate=evidence_info["uploadDate"],
-            fileSize=evidence_info["fileSize"],
-            tags=evidence_info["tags"],
-            duration=evidence_info.get("duration"),
-            thumbnail=evidence_info.get("thumbnail"),
-            created_at=evidence_data.get("created_at"),
-            updated_at=evidence_data.get("updated_at")
-        )
+        await response_cache.delete_prefix(EVIDENCE_CACHE_PREFIX)
+        await invalidate_case_cache(evidence_data["case_id"])
+        return _evidence_json_response(evidence_data)
         
     except HTTPException:
         raise
@@ -253,9 +317,9 @@ async def update_evidence(
 async def delete_evidence(evidence_id: str):
     """Delete evidence."""
     try:
-        client = supabase_client.get_client()
+        client = supabase_client.get_async_client()
         
-        response = client.table("evidence").delete().eq("id", evidence_id).execute()
+        response = await returning(client.table("evidence").delete().eq("id", evidence_id), "id,case_id").execute()
         
         if not response.data:
             raise HTTPException(
@@ -263,6 +327,9 @@ async def delete_evidence(evidence_id: str):
                 detail="Evidence not found"
             )
         
+        await response_cache.delete_prefix(EVIDENCE_CACHE_PREFIX)
+        await invalidate_case_cache(response.data[0]["case_id"])
+        
         return {"message": "Evidence deleted successfully"}
         
     except HTTPException:
@@ -1,9 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query
-from typing import List, Optional
+from fastapi.responses import ORJSONResponse
+from starlette.background import BackgroundTask
+from typing import BinaryIO, List, Optional
 from app.schemas.file import FileResponse, FileListResponse
 from app.api.auth import get_current_user
 from app.services.s3_service import s3_service
-from app.core.database import supabase_client
+from app.core.cache import response_cache
+from app.core.database import supabase_client, returning
+from app.utils.retry import retry_async
+import asyncio
+import hashlib
+import os
 import uuid
 import logging
 from datetime import datetime
@@ -11,56 +18,145 @@ from datetime import datetime
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Columns read when building FileResponse
+FILE_COLUMNS = "id,filename,object_name,content_type,size,url,bucket,created_at,user_id"
+
+# Response cache key prefix for S3 existence checks on download
+FILE_EXISTS_CACHE_PREFIX = "files:exists:"
+
+# Read size used when hashing uploads
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def _hash_file(file_obj: BinaryIO) -> str:
+    """
+    Return the BLAKE2b content hash of a file and rewind it for the upload.
+    
+    This is an extra read of the whole upload before anything is sent to S3:
+    the hash decides whether the upload can be skipped, so it cannot be taken
+    while streaming. The read is from the local spooled copy (memory or temp
+    file) in a worker thread, which is cheap next to the S3 upload it saves.
+    """
+    digest = hashlib.blake2b(digest_size=32)
+    for chunk in iter(lambda: file_obj.read(HASH_CHUNK_SIZE), b""):
+        digest.update(chunk)
+    file_obj.seek(0)
+    return digest.hexdigest()
+
+
+async def _upload_to_s3(file: UploadFile, object_name: str) -> dict:
+    """Upload the request file to S3 from the start, raising HTTPException on failure."""
+    file.file.seek(0)
+    upload_result = await s3_service.upload_file(
+        file_obj=file.file,
+        object_name=object_name,
+        content_type=file.content_type
+    )
+    
+    if not upload_result["success"]:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to upload file: {upload_result.get('error', 'Unknown error')}"
+        )
+    
+    return upload_result
+
 
 @router.post("/upload", response_model=FileResponse)
 async def upload_file(
     file: UploadFile = File(...),
     current_user: dict = Depends(get_current_user)
 ):
-    """Upload a file to S3 and save metadata to Supabase."""
+    """
+    Upload a file to S3 and save metadata to Supabase.
+    
+    If the user already has a file with identical content, the new record
+    points at the existing S3 object and nothing is uploaded. The new row is
+    inserted before the source row is re-checked, so a concurrent delete of
+    the source either sees the new row and keeps the object, or has already
+    tombstoned the source, in which case the content is uploaded after all.
+    """
     try:
-        # Generate unique object name
-        file_extension = file.filename.split('.')[-1] if '.' in file.filename else ''
-        object_name = f"{current_user['id']}/{uuid.uuid4()}.{file_extension}"
-        
-        # Upload to S3
-        upload_result = await s3_service.upload_file(
-            file_obj=file.file,
-            object_name=object_name,
-            content_type=file.content_type
-        )
-        
-        if not upload_result["success"]:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to upload file: {upload_result.get('error', 'Unknown error')}"
-            )
+        client = supabase_client.get_async_client()
+        
+        # One UUID serves as both the file ID and the S3 object name
+        file_id = str(uuid.uuid4())
+        own_object_name = f"{current_user['id']}/{file_id}{os.path.splitext(file.filename)[1]}"
+        content_hash = await asyncio.to_thread(_hash_file, file.file)
+        
+        existing = await client.table("files").select("id,object_name,size").eq("user_id", current_user["id"]).eq("content_hash", content_hash).is_("deleted_at", "null").limit(1).execute()
+        source = existing.data[0] if existing.data else None
+        
+        if source:
+            object_name = source["object_name"]
+            upload_result = {
+                "url": s3_service.generate_presigned_url(object_name),
+                "bucket": s3_service.bucket_name,
+                "size": source["size"]
+            }
+        else:
+            object_name = own_object_name
+            upload_result = await _upload_to_s3(file, object_name)
         
         # Save file metadata to Supabase
-        client = supabase_client.get_client()
         file_data = {
-            "id": str(uuid.uuid4()),
+            "id": file_id,
             "filename": file.filename,
             "object_name": object_name,
             "content_type": file.content_type,
-            "size": file.size,
+            "size": upload_result["size"],
             "url": upload_result["url"],
             "bucket": upload_result["bucket"],
             "user_id": current_user["id"],
+            "content_hash": content_hash,
             "created_at": datetime.utcnow().isoformat()
         }
         
-        response = client.table("files").insert(file_data).execute()
+        try:
+            response = await client.table("files").insert(file_data).execute()
+        except Exception as e:
+            logger.error(f"Error saving metadata for {object_name}: {e}")
+            response = None
         
-        if not response.data:
-            # If database insert fails, clean up S3 file
-            await s3_service.delete_file(object_name)
-            raise HTTPException(
+        if not response or not response.data:
+            # If database insert fails, clean up a newly uploaded S3 object after the error has been sent
+            return ORJSONResponse(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to save file metadata"
+                content={"detail": "Failed to save file metadata"},
+                background=None if source else BackgroundTask(s3_service.delete_file, object_name)
             )
         
-        return FileResponse(**response.data[0])
+        file_row = response.data[0]
+        
+        if source:
+            # If the source row was tombstoned before our insert, its delete may not have
+            # seen our row and can remove the shared object: store our own copy instead
+            source_live = await client.table("files").select("id").eq("id", source["id"]).is_("deleted_at", "null").execute()
+            
+            if not source_live.data:
+                upload_result = await _upload_to_s3(file, own_object_name)
+                try:
+                    response = await client.table("files").update({
+                        "object_name": own_object_name,
+                        "url": upload_result["url"],
+                        "bucket": upload_result["bucket"],
+                        "size": upload_result["size"]
+                    }).eq("id", file_id).execute()
+                except Exception as e:
+                    logger.error(f"Error moving {file_id} to its own object {own_object_name}: {e}")
+                    response = None
+                
+                if not response or not response.data:
+                    await client.table("files").delete().eq("id", file_id).execute()
+                    return ORJSONResponse(
+                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                        content={"detail": "Failed to save file metadata"},
+                        background=BackgroundTask(s3_service.delete_file, own_object_name)
+                    )
+                
+                file_row = response.data[0]
+        
+        return FileResponse(**file_row)
         
     except HTTPException:
         raise
@@ -80,17 +176,14 @@ async def get_files(
 ):
     """Get user's files with pagination."""
     try:
-        client = supabase_client.get_client()
+        client = supabase_client.get_async_client()
         
         # Calculate offset
         offset = (page - 1) * per_page
         
-        # Get files for current user
-        response = client.table("files").select("*").eq("user_id", current_user["id"]).range(offset, offset + per_page - 1).execute()
-        
-        # Get total count
-        count_response = client.table("files").select("id", count="exact").eq("user_id", current_user["id"]).execute()
-        total = count_response.count or 0
+        # Get one page of the current user's files, with the total count in the same response
+        response = await client.table("files").select(FILE_COLUMNS, count="exact").eq("user_id", current_user["id"]).is_("deleted_at", "null").order("created_at", desc=True).range(offset, offset + per_page - 1).execute()
+        total = response.count or 0
         
         files = [FileResponse(**file_data) for file_data in response.data]
         
@@ -113,9 +206,9 @@ async def get_files(
 async def get_file(file_id: str, current_user: dict = Depends(get_current_user)):
     """Get a specific file by ID."""
     try:
-        client = supabase_client.get_client()
+        client = supabase_client.get_async_client()
         
-        response = client.table("files").select("*").eq("id", file_id).eq("user_id", current_user["id"]).execute()
+        response = await client.table("files").select(FILE_COLUMNS).eq("id", file_id).eq("user_id", current_user["id"]).is_("deleted_at", "null").execute()
         
         if not response.data:
             raise HTTPException(
@@ -139,10 +232,10 @@ async def get_file(file_id: str, current_user: dict = Depends(get_current_user))
 async def download_file(file_id: str, current_user: dict = Depends(get_current_user)):
     """Download a file from S3."""
     try:
-        client = supabase_client.get_client()
+        client = supabase_client.get_async_client()
         
         # Get file metadata
-        response = client.table("files").select("*").eq("id", file_id).eq("user_id", current_user["id"]).execute()
+        response = await client.table("files").select("object_name, filename, content_type, size").eq("id", file_id).eq("user_id", current_user["id"]).is_("deleted_at", "null").execute()
         
         if not response.data:
             raise HTTPException(
@@ -152,14 +245,17 @@ async def download_file(file_id: str, current_user: dict = Depends(get_current_u
         
         file_data = response.data[0]
         
-        # Download file from S3
-        file_content = await s3_service.download_file(file_data["object_name"])
+        # Check the object is still in S3 (HEAD only); positive results are cached briefly.
+        # No stale fallback: during an S3 outage a removed object must not be reported as present.
+        async def check_exists() -> bytes:
+            if not await s3_service.file_exists(file_data["object_name"]):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="File not found in storage"
+                )
+            return b"1"
         
-        if file_content is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="File not found in storage"
-            )
+        await response_cache.get_or_load(f"{FILE_EXISTS_CACHE_PREFIX}{file_data['object_name']}", check_exists, allow_stale=False)
         
         # Generate presigned URL for download
         download_url = s3_service.generate_presigned_url(
@@ -186,12 +282,23 @@ async def download_file(file_id: str, current_user: dict = Depends(get_current_u
 
 @router.delete("/{file_id}")
 async def delete_file(file_id: str, current_user: dict = Depends(get_current_user)):
-    """Delete a file from both S3 and database."""
+    """
+    Delete a file from both S3 and database.
+    
+    The row is tombstoned first, then the S3 object and finally the row are
+    deleted. Every step is idempotent, so a request that fails part-way can
+    simply be retried; tombstoned rows are already hidden from reads.
+    """
     try:
-        client = supabase_client.get_client()
-        
-        # Get file metadata
-        response = client.table("files").select("*").eq("id", file_id).eq("user_id", current_user["id"]).execute()
+        client = supabase_client.get_async_client()
+        
+        # Tombstone the row (also matches rows left tombstoned by an earlier failed attempt)
+        response = await retry_async(
+            lambda: returning(
+                client.table("files").update({"deleted_at": datetime.utcnow().isoformat()}).eq("id", file_id).eq("user_id", current_user["id"]),
+                "object_name"
+            ).execute()
+        )
         
         if not response.data:
             raise HTTPException(
@@ -199,16 +306,30 @@ async def delete_file(file_id: str, current_user: dict = Depends(get_current_use
                 detail="File not found"
             )
         
-        file_data = response.data[0]
+        object_name = response.data[0]["object_name"]
         
-        # Delete from S3
-        s3_success = await s3_service.delete_file(file_data["object_name"])
+        # Make downloads re-check S3 instead of trusting a cached existence result; dropped
+        # again after the S3 delete in case a concurrent download re-cached it meanwhile
+        await response_cache.delete(f"{FILE_EXISTS_CACHE_PREFIX}{object_name}")
         
-        # Delete from database
-        client.table("files").delete().eq("id", file_id).execute()
+        # Keep the S3 object while deduplicated uploads still point at it; checked only after
+        # the tombstone, so an upload that deduplicated against this row either shows up here
+        # or sees the tombstone and stores its own copy (see upload_file)
+        shared = await retry_async(
+            lambda: client.table("files").select("id").eq("object_name", object_name).neq("id", file_id).is_("deleted_at", "null").limit(1).execute()
+        )
         
-        if not s3_success:
-            logger.warning(f"File {file_id} deleted from database but not from S3")
+        if not shared.data:
+            # Delete from S3; deleting a missing object succeeds, so retries are safe
+            async def delete_object() -> None:
+                if not await s3_service.delete_file(object_name):
+                    raise RuntimeError(f"S3 refused to delete {object_name}")
+            
+            await retry_async(delete_object, retry_on=(RuntimeError,))
+            await response_cache.delete(f"{FILE_EXISTS_CACHE_PREFIX}{object_name}")
+        
+        # Hard-delete the tombstoned row
+        await retry_async(lambda: returning(client.table("files").delete().eq("id", file_id), "id").execute())
         
         return {"message": "File deleted successfully"}
         
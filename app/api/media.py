@@ -1,10 +1,16 @@
-from fastapi import APIRouter, HTTPException, status, UploadFile, File, Form, BackgroundTasks
-from app.schemas.media import MediaResponse, MediaCreate, MediaUpdate
+from fastapi import APIRouter, Header, HTTPException, status, UploadFile, File, Form, BackgroundTasks, Query
+from fastapi.responses import StreamingResponse
+from app.schemas.media import MediaResponse, MediaListResponse, MediaCreate, MediaUpdate
 from app.schemas.audio import AudioUploadResponse
-from app.core.database import supabase_client
+from postgrest.exceptions import APIError
+from app.core.cache import response_cache, cached_json_response
+from app.core.database import supabase_client, UNIQUE_VIOLATION, FOREIGN_KEY_VIOLATION, returning
+from app.api.cases import invalidate_case_cache
+from app.utils.streaming import NDJSON_MEDIA_TYPE, aiter_ndjson, aiter_query_rows
 from app.services.audio_service import AudioService
 from app.services.s3_service import s3_service
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, Optional
+from pydantic import TypeAdapter
 from datetime import datetime
 import uuid
 import logging
@@ -12,44 +18,94 @@ import logging
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+MEDIA_COLUMNS = "id,case_id,media_info,created_at,updated_at"
 
-@router.get("/", response_model=list[MediaResponse])
-async def get_media():
-    """Get all media."""
+# Response cache keys: media:all:<page>:<per_page>, media:case:<case_id>:<page>:<per_page> and media:id:<media_id>
+MEDIA_CACHE_PREFIX = "media:"
+
+# Page size bounds for the list endpoints
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Upper bound on rows accepted by the bulk create endpoint
+MAX_BULK_CREATE = 500
+
+# Validates whole media lists in one call into pydantic-core
+_media_list_adapter = TypeAdapter(list[MediaResponse])
+_media_page_adapter = TypeAdapter(MediaListResponse)
+
+
+def _media_row(media_data: dict) -> dict:
+    """Flatten a media row into the MediaResponse field names."""
+    return {
+        **media_data["media_info"],
+        "id": media_data["id"],
+        "caseId": media_data["case_id"],
+        "created_at": media_data.get("created_at"),
+        "updated_at": media_data.get("updated_at")
+    }
+
+
+def _media_insert_row(media_create: MediaCreate) -> dict:
+    """Build the media row to insert; without an ID the column default generates one."""
+    row = {
+        "case_id": media_create.case_id,
+        "media_info": media_create.media_info.model_dump(mode="json")
+    }
+    if media_create.id is not None:
+        row["id"] = media_create.id
+    return row
+
+
+async def _load_media_page(page: int, per_page: int, case_id: Optional[str] = None) -> bytes:
+    """Fetch one page of media (newest first) with its total count, as MediaListResponse JSON."""
+    client = supabase_client.get_async_client()
+    offset = (page - 1) * per_page
+    
+    query = client.table("media").select(MEDIA_COLUMNS, count="exact")
+    if case_id is not None:
+        query = query.eq("case_id", case_id)
+    response = await query.order("created_at", desc=True).range(offset, offset + per_page - 1).execute()
+    
+    return _media_page_adapter.dump_json(_media_page_adapter.validate_python({
+        "media": [_media_row(media_data) for media_data in response.data],
+        "total": response.count or 0,
+        "page": page,
+        "per_page": per_page
+    }))
+
+
+async def _stream_media_ndjson(case_id: Optional[str] = None) -> StreamingResponse:
+    """Stream every matching media row (newest first) as newline-delimited MediaResponse JSON."""
+    client = supabase_client.get_async_client()
+    
+    def query():
+        query = client.table("media").select(MEDIA_COLUMNS)
+        if case_id is not None:
+            query = query.eq("case_id", case_id)
+        return query.order("created_at", desc=True).order("id")
+    
+    rows = await aiter_query_rows(query)
+    
+    async def items() -> AsyncIterator[Dict[str, Any]]:
+        async for media_data in rows:
+            yield MediaResponse.model_validate(_media_row(media_data)).model_dump(mode="json")
+    
+    return StreamingResponse(aiter_ndjson(items()), media_type=NDJSON_MEDIA_TYPE)
+
+
+@router.get("/", response_model=MediaListResponse)
+async def get_media(
+    page: int = Query(1, ge=1),
+    per_page: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+):
+    """Get media with pagination."""
     try:
-        client = supabase_client.get_client()
-        
-        response = client.table("media").select("*").order("created_at", desc=True).execute()
-        
-        media_list = []
-        for media_data in response.data:
-            media_info = media_data["media_info"]
-            media_list.append(MediaResponse(
-                id=media_data["id"],
-                caseId=media_data["case_id"],
-                type=media_info["type"],
-                url=media_info["url"],
-                title=media_info["title"],
-                description=media_info["description"],
-                fileSize=media_info.get("fileSize"),
-                format=media_info.get("format"),
-                uploadDate=media_info.get("uploadDate"),
-                duration=media_info.get("duration"),
-                transcript=media_info.get("transcript"),
-                speakers=media_info.get("speakers"),
-                confidence=media_info.get("confidence"),
-                resolution=media_info.get("resolution"),
-                fps=media_info.get("fps"),
-                thumbnail=media_info.get("thumbnail"),
-                camera=media_info.get("camera"),
-                location=media_info.get("location"),
-                pages=media_info.get("pages"),
-                author=media_info.get("author"),
-                created_at=media_data.get("created_at"),
-                updated_at=media_data.get("updated_at")
-            ))
-        
-        return media_list
+        content, cache_state = await response_cache.lookup(
+            f"{MEDIA_CACHE_PREFIX}all:{page}:{per_page}",
+            lambda: _load_media_page(page, per_page)
+        )
+        return cached_json_response(content, cache_state)
         
     except Exception as e:
         logger.error(f"Error fetching media: {e}")
@@ -59,47 +115,38 @@ async def get_media():
         )
 
 
-@router.get("/{media_id}", response_model=MediaResponse)
-async def get_media_by_id(media_id: str):
-    """Get a specific media by ID."""
+@router.get("/stream")
+async def stream_media():
+    """Stream all media, newest first, as newline-delimited JSON (one MediaResponse per line)."""
     try:
-        client = supabase_client.get_client()
-        
-        response = client.table("media").select("*").eq("id", media_id).execute()
-        
-        if not response.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Media not found"
-            )
+        return await _stream_media_ndjson()
         
-        media_data = response.data[0]
-        media_info = media_data["media_info"]
-        
-        return MediaResponse(
-            id=media_data["id"],
-            caseId=media_data["case_id"],
-            type=media_info["type"],
-            url=media_info["url"],
-            title=media_info["title"],
-            description=media_info["description"],
-            fileSize=media_info.get("fileSize"),
-            format=media_info.get("format"),
-            uploadDate=media_info.get("uploadDate"),
-            duration=media_info.get("duration"),
-            transcript=media_info.get("transcript"),
-            speakers=media_info.get("speakers"),
-            confidence=media_info.get("confidence"),
-            resolution=media_info.get("resolution"),
-            fps=media_info.get("fps"),
-            thumbnail=media_info.get("thumbnail"),
-            camera=media_info.get("camera"),
-            location=media_info.get("location"),
-            pages=media_info.get("pages"),
-            author=media_info.get("author"),
-            created_at=media_data.get("created_at"),
-            updated_at=media_data.get("updated_at")
+    except Exception as e:
+        logger.error(f"Error streaming media: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch media"
         )
+
+
+@router.get("/{media_id}", response_model=MediaResponse)
+async def get_media_by_id(media_id: str, if_none_match: Optional[str] = Header(None)):
+    """Get a specific media by ID; a matching If-None-Match gets a 304 with no body."""
+    try:
+        async def load() -> bytes:
+            client = supabase_client.get_async_client()
+            response = await client.table("media").select(MEDIA_COLUMNS).eq("id", media_id).maybe_single().execute()
+            
+            if response is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Media not found"
+                )
+            
+            return MediaResponse.model_validate(_media_row(response.data)).model_dump_json().encode()
+        
+        content, cache_state = await response_cache.lookup(f"{MEDIA_CACHE_PREFIX}id:{media_id}", load)
+        return cached_json_response(content, cache_state, if_none_match)
         
     except HTTPException:
         raise
@@ -111,43 +158,20 @@ async def get_media_by_id(media_id: str):
         )
 
 
-@router.get("/case/{case_id}", response_model=list[MediaResponse])
-async def get_media_by_case_id(case_id: str):
-    """Get all media for a specific case."""
+@router.get("/case/{case_id}", response_model=MediaListResponse)
+async def get_media_by_case_id(
+    case_id: str,
+    page: int = Query(1, ge=1),
+    per_page: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    if_none_match: Optional[str] = Header(None)
+):
+    """Get media for a specific case with pagination; a matching If-None-Match gets a 304 with no body."""
     try:
-        client = supabase_client.get_client()
-        
-        response = client.table("media").select("*").eq("case_id", case_id).order("created_at", desc=True).execute()
-        
-        media_list = []
-        for media_data in response.data:
-            media_info = media_data["media_info"]
-            media_list.append(MediaResponse(
-                id=media_data["id"],
-                caseId=media_data["case_id"],
-                type=media_info["type"],
-                url=media_info["url"],
-                title=media_info["title"],
-                description=media_info["description"],
-                fileSize=media_info.get("fileSize"),
-                format=media_info.get("format"),
-                uploadDate=media_info.get("uploadDate"),
-                duration=media_info.get("duration"),
-                transcript=media_info.get("transcript"),
-                speakers=media_info.get("speakers"),
-                confidence=media_info.get("confidence"),
-                resolution=media_info.get("resolution"),
-                fps=media_info.get("fps"),
-                thumbnail=media_info.get("thumbnail"),
-                camera=media_info.get("camera"),
-                location=media_info.get("location"),
-                pages=media_info.get("pages"),
-                author=media_info.get("author"),
-                created_at=media_data.get("created_at"),
-                updated_at=media_data.get("updated_at")
-            ))
-        
-        return media_list
+        content, cache_state = await response_cache.lookup(
+            f"{MEDIA_CACHE_PREFIX}case:{case_id}:{page}:{per_page}",
+            lambda: _load_media_page(page, per_page, case_id)
+        )
+        return cached_json_response(content, cache_state, if_none_match)
         
     except Exception as e:
         logger.error(f"Error fetching media for case {case_id}: {e}")
@@ -157,34 +181,41 @@ async def get_media_by_case_id(case_id: str):
         )
 
 
+@router.get("/case/{case_id}/stream")
+async def stream_media_by_case_id(case_id: str):
+    """Stream all media for a specific case, newest first, as newline-delimited JSON."""
+    try:
+        return await _stream_media_ndjson(case_id)
+        
+    except Exception as e:
+        logger.error(f"Error streaming media for case {case_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch media for case"
+        )
+
+
 @router.post("/", response_model=MediaResponse)
 async def create_media(media_create: MediaCreate):
     """Create new media."""
     try:
-        client = supabase_client.get_client()
+        client = supabase_client.get_async_client()
         
-        # Check if media with this ID already exists
-        existing_response = client.table("media").select("id").eq("id", media_create.id).execute()
-        if existing_response.data:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Media with this ID already exists"
-            )
-        
-        # Check if the case exists
-        case_response = client.table("cases").select("id").eq("id", media_create.case_id).execute()
-        if not case_response.data:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Case not found"
-            )
-        
-        # Insert new media
-        response = client.table("media").insert({
-            "id": media_create.id,
-            "case_id": media_create.case_id,
-            "media_info": media_create.media_info.dict()
-        }).execute()
+        # Insert new media, relying on the primary and foreign keys to reject duplicates and unknown cases
+        try:
+            response = await client.table("media").insert(_media_insert_row(media_create)).execute()
+        except APIError as e:
+            if e.code == UNIQUE_VIOLATION:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Media with this ID already exists"
+                )
+            if e.code == FOREIGN_KEY_VIOLATION:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Case not found"
+                )
+            raise
         
         if not response.data:
             raise HTTPException(
@@ -193,32 +224,9 @@ async def create_media(media_create: MediaCreate):
             )
         
         media_data = response.data[0]
-        media_info = media_data["media_info"]
-        
-        return MediaResponse(
-            id=media_data["id"],
-            caseId=media_data["case_id"],
-            type=media_info["type"],
-            url=media_info["url"],
-            title=media_info["title"],
-            description=media_info["description"],
-            fileSize=media_info.get("fileSize"),
-            format=media_info.get("format"),
-            uploadDate=media_info.get("uploadDate"),
-            duration=media_info.get("duration"),
-            transcript=media_info.get("transcript"),
-            speakers=media_info.get("speakers"),
-            confidence=media_info.get("confidence"),
-            resolution=media_info.get("resolution"),
-            fps=media_info.get("fps"),
-            thumbnail=media_info.get("thumbnail"),
-            camera=media_info.get("camera"),
-            location=media_info.get("location"),
-            pages=media_info.get("pages"),
-            author=media_info.get("author"),
-            created_at=media_data.get("created_at"),
-            updated_at=media_data.get("updated_at")
-        )
+        await response_cache.delete_prefix(MEDIA_CACHE_PREFIX)
+        await invalidate_case_cache(media_data["case_id"])
+        return MediaResponse.model_validate(_media_row(media_data))
         
     except HTTPException:
         raise
@@ -230,6 +238,57 @@ async def create_media(media_create: MediaCreate):
         )
 
 
+@router.post("/bulk", response_model=list[MediaResponse])
+async def create_media_bulk(media_creates: list[MediaCreate]):
+    """Create several media records in a single insert; either all are created or none."""
+    if not media_creates:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No media to create"
+        )
+    if len(media_creates) > MAX_BULK_CREATE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BULK_CREATE} media records can be created at once"
+        )
+    
+    try:
+        client = supabase_client.get_async_client()
+        
+        # One multi-row INSERT; the primary and foreign keys reject duplicates and unknown cases,
+        # and rows without an ID get the column default rather than NULL
+        try:
+            response = await client.table("media").insert(
+                [_media_insert_row(media_create) for media_create in media_creates],
+                default_to_null=False
+            ).execute()
+        except APIError as e:
+            if e.code == UNIQUE_VIOLATION:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Media with one of these IDs already exists"
+                )
+            if e.code == FOREIGN_KEY_VIOLATION:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Case not found"
+                )
+            raise
+        
+        await response_cache.delete_prefix(MEDIA_CACHE_PREFIX)
+        await invalidate_case_cache(*{media_data["case_id"] for media_data in response.data})
+        return _media_list_adapter.validate_python([_media_row(media_data) for media_data in response.data])
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error creating media in bulk: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create media"
+        )
+
+
 @router.put("/{media_id}", response_model=MediaResponse)
 async def update_media(
     media_id: str, 
@@ -237,29 +296,21 @@ async def update_media(
 ):
     """Update media."""
     try:
-        client = supabase_client.get_client()
-        
-        # Check if media exists
-        existing_response = client.table("media").select("*").eq("id", media_id).execute()
-        if not existing_response.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Media not found"
-            )
+        client = supabase_client.get_async_client()
         
-        # Prepare update data
-        update_data = {}
+        # Only send the media_info keys the client actually set
+        patch = {}
         if media_update.media_info:
-            update_data["media_info"] = media_update.media_info.dict()
+            patch = media_update.media_info.model_dump(mode="json", exclude_unset=True, exclude_none=True)
         
-        if not update_data:
+        if not patch:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="No fields to update"
             )
         
-        # Update media
-        response = client.table("media").update(update_data).eq("id", media_id).execute()
+        # Merge the patch into media_info server-side; no returned row means the media does not exist
+        response = await client.rpc("update_media_info", {"p_id": media_id, "p_patch": patch}).execute()
         
         if not response.data:
             raise HTTPException(
@@ -268,32 +319,9 @@ async def update_media(
             )
         
         media_data = response.data[0]
-        media_info = media_data["media_info"]
-        
-        return MediaResponse(
-            id=media_data["id"],
-            caseId=media_data["case_id"],
-            type=media_info["type"],
-            url=media_info["url"],
-            title=media_info["title"],
-            description=media_info["description"],
-            fileSize=media_info.get("fileSize"),
-            format=media_info.get("format"),
-            uploadDate=media_info.get("uploadDate"),
-            duration=media_info.get("duration"),
-            transcript=media_info.get("transcript"),
-            speakers=media_info.get("speakers"),
-            confidence=media_info.get("confidence"),
-            resolution=media_info.get("resolution"),
-            fps=media_info.get("fps"),
-            thumbnail=media_info.get("thumbnail"),
-            camera=media_info.get("camera"),
-            location=media_info.get("location"),
-            pages=media_info.get("pages"),
-            author=media_info.get("author"),
-            created_at=media_data.get("created_at"),
-            updated_at=media_data.get("updated_at")
-        )
+        await response_cache.delete_prefix(MEDIA_CACHE_PREFIX)
+        await invalidate_case_cache(media_data["case_id"])
+        return MediaResponse.model_validate(_media_row(media_data))
         
     except HTTPException:
         raise
@@ -309,9 +337,9 @@ async def update_media(
 async def delete_media(media_id: str):
     """Delete media."""
     try:
-        client = supabase_client.get_client()
+        client = supabase_client.get_async_client()
         
-        response = client.table("media").delete().eq("id", media_id).execute()
+        response = await returning(client.table("media").delete().eq("id", media_id), "id,case_id").execute()
         
         if not response.data:
             raise HTTPException(
@@ -319,6 +347,9 @@ async def delete_media(media_id: str):
                 detail="Media not found"
             )
         
+        await response_cache.delete_prefix(MEDIA_CACHE_PREFIX)
+        await invalidate_case_cache(response.data[0]["case_id"])
+        
         return {"message": "Media deleted successfully"}
         
     except HTTPException:
@@ -374,87 +405,46 @@ async def upload_media_file(
                 detail="File must have a filename"
             )
         
-        # Read file data
-        file_data = await file.read()
-        
-        # Log file size for debugging
-        file_size_mb = len(file_data) / (1024 * 1024)
-        logger.info(f"Media file size: {file_size_mb:.2f} MB")
-        
-        if file_size_mb > 50:
-            logger.warning(f"Large media file detected ({file_size_mb:.2f} MB). This may cause timeout issues.")
-        
-        # Upload to S3 and database using audio service (it handles S3 upload)
+        media_id = str(uuid.uuid4())
+        
+        # Parse tags if provided
+        tag_list = []
+        if tags:
+            tag_list = [tag.strip() for tag in tags.split(',') if tag.strip()]
+        
+        # Determine file format
+        file_extension = file.filename.split('.')[-1].lower() if '.' in file.filename else 'unknown'
+        
+        # Prepare media info; the audio service fills in the S3 URL and file size after the upload
+        media_info = {
+            "type": type,
+            "title": title or f"{type.title()} File - {file.filename}",
+            "description": description or f"{type.title()} file: {file.filename}",
+            "format": file_extension,
+            "uploadDate": datetime.now().strftime("%Y-%m-%d"),
+            "tags": tag_list,
+            "location": location,
+            "author": author,
+            "transcript": "",  # Will be filled after transcription for audio
+            "follow_up_questions": []
+        }
+        
+        # Upload to S3 (streamed in parts), then write the audio_files and media rows in one transaction
         audio_service = AudioService()
         upload_response = await audio_service.upload_audio_file(
             filename=file.filename,
             content_type=file.content_type,
-            size=len(file_data),
-            audio_data=file_data
-        )
-        
-        # Generate S3 URL for the uploaded file
-        s3_url = s3_service.generate_presigned_url(
-            object_name=upload_response.s3_key,
-            expiration=604800  # 7 days
-        )
-        
-        # Save to media table
-        try:
-            media_id = str(uuid.uuid4())
-            
-            # Parse tags if provided
-            tag_list = []
-            if tags:
-                tag_list = [tag.strip() for tag in tags.split(',') if tag.strip()]
-            
-            # Determine file format
-            file_extension = file.filename.split('.')[-1].lower() if '.' in file.filename else 'unknown'
-            
-            # Prepare media info with proper S3 URL
-            media_info = {
-                "type": type,
-                "url": s3_url or upload_response.s3_key,  # Use S3 URL if available, fallback to key
-                "title": title or f"{type.title()} File - {file.filename}",
-                "description": description or f"{type.title()} file: {file.filename}",
-                "fileSize": f"{len(file_data) / (1024 * 1024):.2f} MB",
-                "format": file_extension,
-                "uploadDate": datetime.now().strftime("%Y-%m-%d"),
-                "tags": tag_list,
-                "location": location,
-                "author": author
+            file_obj=file.file,
+            media_record={
+                "id": media_id,
+                "case_id": case_id,
+                "media_info": media_info
             }
-            
-            # Save to media table
-            media_saved = await audio_service.save_audio_to_media_table(
-                media_id=media_id,
-                case_id=case_id,
-                url=s3_url or upload_response.s3_key,  # Use S3 URL if available, fallback to key
-                transcript="",  # Will be filled after transcription for audio
-                title=media_info["title"],
-                summary=media_info["description"],
-                duration=None,
-                speakers=None,
-                confidence=None,
-                follow_up_questions=[]
-            )
-            
-            if media_saved:
-                # Add media_id and S3 URL to response
-                upload_response.media_id = media_id
-                upload_response.upload_url = s3_url  # Add S3 URL to response
-                logger.info(f"Media file uploaded and saved to media table: {file.filename} (media_id: {media_id})")
-                logger.info(f"S3 URL generated: {s3_url}")
-            else:
-                logger.error(f"Failed to save to media table for file: {file.filename}")
-                upload_response.media_id = None
-            
-        except Exception as e:
-            logger.error(f"Failed to save to media table: {e}")
-            upload_response.media_id = None
-            # Continue with upload even if media save fails
+        )
+        await response_cache.delete_prefix(MEDIA_CACHE_PREFIX)
+        await invalidate_case_cache(case_id)
         
-        logger.info(f"Media file uploaded: {file.filename} ({len(file_data)} bytes)")
+        logger.info("Media file uploaded and saved to media table: %s (%d bytes, media_id: %s)", file.filename, upload_response.size, media_id)
         
         return upload_response
         
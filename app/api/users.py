@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from app.schemas.user import UserResponse, UserUpdate
 from app.api.auth import get_current_user
-from app.core.database import supabase_client
+from app.core.database import supabase_client, returning
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,10 +12,10 @@ router = APIRouter()
 async def get_users(current_user: dict = Depends(get_current_user)):
     """Get all users (admin only - implement role checking as needed)."""
     try:
-        client = supabase_client.get_client()
+        client = supabase_client.get_async_client()
         
         # This is a simple example - in production, you'd want proper role-based access control
-        response = client.table("users").select("*").execute()
+        response = await client.table("users").select("*").execute()
         
         users = []
         for user_data in response.data:
@@ -41,17 +41,17 @@ async def get_users(current_user: dict = Depends(get_current_user)):
 async def get_user(user_id: str, current_user: dict = Depends(get_current_user)):
     """Get a specific user by ID."""
     try:
-        client = supabase_client.get_client()
+        client = supabase_client.get_async_client()
         
-        response = client.table("users").select("*").eq("id", user_id).execute()
+        response = await client.table("users").select("*").eq("id", user_id).maybe_single().execute()
         
-        if not response.data:
+        if response is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
             )
         
-        user_data = response.data[0]
+        user_data = response.data
         return UserResponse(
             id=user_data["id"],
             email=user_data["email"],
@@ -85,7 +85,7 @@ async def update_user(
                 detail="Not authorized to update this user"
             )
         
-        client = supabase_client.get_client()
+        client = supabase_client.get_async_client()
         
         # Prepare update data
         update_data = {}
@@ -100,7 +100,7 @@ async def update_user(
                 detail="No fields to update"
             )
         
-        response = client.table("users").update(update_data).eq("id", user_id).execute()
+        response = await client.table("users").update(update_data).eq("id", user_id).execute()
         
         if not response.data:
             raise HTTPException(
@@ -138,9 +138,9 @@ async def delete_user(user_id: str, current_user: dict = Depends(get_current_use
                 detail="Not authorized to delete this user"
             )
         
-        client = supabase_client.get_client()
+        client = supabase_client.get_async_client()
         
-        response = client.table("users").delete().eq("id", user_id).execute()
+        response = await returning(client.table("users").delete().eq("id", user_id), "id").execute()
         
         if not response.data:
             raise HTTPException(
@@ -0,0 +1,207 @@
+import asyncio
+import hashlib
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+from cachetools import TTLCache
+from fastapi import status
+from fastapi.responses import Response
+from redis import asyncio as aioredis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Prefix for the long-lived copies served when a rebuild fails
+STALE_PREFIX = "stale:"
+
+# Values reported by ResponseCache.lookup
+CACHE_HIT = "hit"
+CACHE_MISS = "miss"
+CACHE_STALE = "stale"
+
+
+class ResponseCache:
+    """
+    Cache of serialized (JSON bytes) responses.
+
+    Backed by Redis when `redis_url` is configured, so all workers share
+    entries and invalidations; otherwise by an in-process TTL cache. With
+    Redis, each worker also keeps hot entries in process for
+    `local_cache_ttl` seconds, so invalidations reach other workers within
+    that window. Every entry also keeps a stale copy for `cache_stale_ttl`
+    seconds that is served if rebuilding the entry fails.
+    """
+
+    def __init__(self):
+        self.redis: Optional[aioredis.Redis] = None
+        local_ttl = settings.local_cache_ttl if settings.redis_url else settings.case_cache_ttl
+        self.local = TTLCache(maxsize=1024, ttl=local_ttl)
+        self.local_stale = TTLCache(maxsize=1024, ttl=settings.cache_stale_ttl)
+        # Per-key fill locks and how many requests hold or wait on each; dropped when unused
+        self.locks: Dict[str, asyncio.Lock] = {}
+        self.lock_users: Dict[str, int] = {}
+
+    async def init(self) -> None:
+        """Connect to Redis if configured."""
+        if settings.redis_url and self.redis is None:
+            self.redis = aioredis.from_url(settings.redis_url)
+            await self.redis.ping()
+            logger.info("Redis response cache connected")
+
+    async def close(self) -> None:
+        """Close the Redis connection, if any."""
+        if self.redis is not None:
+            await self.redis.aclose()
+            self.redis = None
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Get a fresh cached value."""
+        value = self.local.get(key)
+        if value is not None or self.redis is None:
+            return value
+        value = await self.redis.get(key)
+        if value is not None:
+            self.local[key] = value
+        return value
+
+    async def get_stale(self, key: str) -> Optional[bytes]:
+        """Get the stale copy of a value."""
+        if self.redis is not None:
+            return await self.redis.get(STALE_PREFIX + key)
+        return self.local_stale.get(key)
+
+    async def set(self, key: str, value: bytes, keep_stale: bool = True) -> None:
+        """Store a value and, unless `keep_stale` is False, its stale copy."""
+        self.local[key] = value
+        if self.redis is not None:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.set(key, value, ex=settings.case_cache_ttl)
+                if keep_stale:
+                    pipe.set(STALE_PREFIX + key, value, ex=settings.cache_stale_ttl)
+                await pipe.execute()
+            return
+        if keep_stale:
+            self.local_stale[key] = value
+
+    async def delete(self, *keys: str) -> None:
+        """Drop fresh and stale copies of the given keys."""
+        for key in keys:
+            self.local.pop(key, None)
+            self.local_stale.pop(key, None)
+        if self.redis is not None:
+            await self.redis.delete(*keys, *(STALE_PREFIX + key for key in keys))
+
+    async def delete_prefix(self, prefix: str) -> None:
+        """Drop fresh and stale copies of every key starting with `prefix`."""
+        for cache in (self.local, self.local_stale):
+            for key in [key for key in cache.keys() if key.startswith(prefix)]:
+                cache.pop(key, None)
+        if self.redis is not None:
+            keys = [key async for key in self.redis.scan_iter(match=f"{prefix}*")]
+            keys += [key async for key in self.redis.scan_iter(match=f"{STALE_PREFIX}{prefix}*")]
+            if keys:
+                await self.redis.delete(*keys)
+
+    @asynccontextmanager
+    async def _key_lock(self, key: str) -> AsyncIterator[None]:
+        """Hold the fill lock for `key`, removing it once no request needs it."""
+        lock = self.locks.get(key)
+        if lock is None:
+            lock = self.locks[key] = asyncio.Lock()
+        self.lock_users[key] = self.lock_users.get(key, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self.lock_users[key] -= 1
+            if not self.lock_users[key]:
+                del self.lock_users[key]
+                del self.locks[key]
+
+    async def lookup(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[bytes]],
+        allow_stale: bool = True
+    ) -> Tuple[bytes, str]:
+        """
+        Return a cached value and how it was obtained: "hit", "miss" or "stale".
+        
+        On a miss the value is loaded under a per-key lock. If the loader fails
+        with an unexpected error and a stale copy exists, the stale copy is
+        returned instead. HTTP errors (e.g. 404) propagate. With
+        `allow_stale=False` no stale copy is kept or served, for values that
+        must not outlive a failed check (e.g. object existence).
+        """
+        cached = await self.get(key)
+        if cached is not None:
+            return cached, CACHE_HIT
+
+        # Only one request per worker rebuilds a given key; concurrent requests wait for it
+        async with self._key_lock(key):
+            cached = await self.get(key)
+            if cached is not None:
+                return cached, CACHE_HIT
+            try:
+                value = await loader()
+            except Exception as e:
+                if not allow_stale or getattr(e, "status_code", None) is not None:
+                    raise
+                stale = await self.get_stale(key)
+                if stale is None:
+                    raise
+                logger.warning("Serving stale cache entry %s: %s", key, type(e).__name__)
+                return stale, CACHE_STALE
+            await self.set(key, value, keep_stale=allow_stale)
+            return value, CACHE_MISS
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[bytes]],
+        allow_stale: bool = True
+    ) -> bytes:
+        """Return a cached value, loading it on a miss (see `lookup`)."""
+        value, _ = await self.lookup(key, loader, allow_stale)
+        return value
+
+
+def etag_for(content: bytes) -> str:
+    """Weak ETag derived from a serialized response body."""
+    return f'W/"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+
+
+def _opaque_tag(tag: str) -> str:
+    """Strip the weak indicator from an entity tag."""
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    """
+    Check an If-None-Match header (single tag, list or *) against `etag`.
+    
+    Uses the weak comparison If-None-Match calls for, so W/"x" and "x" match.
+    """
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or _opaque_tag(etag) in {_opaque_tag(tag) for tag in tags}
+
+
+def cached_json_response(content: bytes, cache_state: str, if_none_match: Optional[str] = None) -> Response:
+    """
+    Wrap cached JSON bytes in a response that reports the cache state in X-Cache.
+    
+    The response carries an ETag over the body; a matching If-None-Match
+    gets a 304 with no body.
+    """
+    headers = {"X-Cache": cache_state, "ETag": etag_for(content)}
+    if etag_matches(headers["ETag"], if_none_match):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+# Global response cache instance
+response_cache = ResponseCache()
@@ -1,3 +1,4 @@
+from functools import cached_property
 from pydantic import Field
 from pydantic_settings import BaseSettings
 from typing import List
@@ -16,6 +17,11 @@ class Settings(BaseSettings):
     supabase_url: str = Field(..., description="Supabase project URL")
     supabase_key: str = Field(..., description="Supabase anon key")
     supabase_service_role_key: str = Field(..., description="Supabase service role key")
+    supabase_http_timeout: float = Field(default=10.0, description="Timeout in seconds for Supabase HTTP requests")
+    supabase_connect_timeout: float = Field(default=2.0, description="Timeout in seconds for opening a new Supabase connection")
+    supabase_max_connections: int = Field(default=100, description="Max pooled connections to Supabase")
+    supabase_max_keepalive_connections: int = Field(default=50, description="Max idle keep-alive connections to Supabase")
+    supabase_keepalive_expiry: float = Field(default=30.0, description="Seconds an idle Supabase connection is kept for reuse")
     
     # AWS S3 Configuration
     aws_access_key_id: str = Field(..., description="AWS access key ID")
@@ -26,13 +32,19 @@ class Settings(BaseSettings):
     # Database Configuration
     database_url: str = Field(default="", description="Direct database URL (optional)")
     
+    # Cache Configuration
+    redis_url: str = Field(default="", description="Redis URL for the shared response cache (optional, in-process cache if empty)")
+    case_cache_ttl: int = Field(default=30, description="Seconds to cache assembled case responses")
+    cache_stale_ttl: int = Field(default=600, description="Seconds to keep stale responses for serving when a rebuild fails")
+    local_cache_ttl: int = Field(default=5, description="Seconds each worker keeps its own copy of Redis-cached responses")
+    
     # CORS Configuration
     allowed_origins: str = Field(
         default="http://localhost:3000,http://localhost:8080",
         description="Allowed CORS origins (comma-separated)"
     )
     
-    @property
+    @cached_property
     def allowed_origins_list(self) -> List[str]:
         """Convert comma-separated origins to list."""
         if self.allowed_origins == "*":
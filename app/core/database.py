@@ -1,8 +1,123 @@
+import asyncio
 import os
-from supabase import create_client, Client
+from typing import Optional, Tuple
+import httpx
+import orjson
+from supabase import create_client, create_async_client, Client, AsyncClient
 from app.core.config import settings
 
 
+# Postgres error codes surfaced by PostgREST as APIError.code
+UNIQUE_VIOLATION = "23505"
+FOREIGN_KEY_VIOLATION = "23503"
+
+# Methods that are safe to replay when a pooled connection turns out to be stale
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class ORJSONDecodedResponse(httpx.Response):
+    """Response whose json() decodes with orjson instead of the stdlib json module."""
+    
+    def json(self, **kwargs):
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError, which postgrest-py catches for empty bodies
+        return orjson.loads(self.content)
+
+
+def _orjson_decoded(response: httpx.Response) -> httpx.Response:
+    """Rewrap a transport response (before its body is read) so that json() uses orjson."""
+    return ORJSONDecodedResponse(
+        status_code=response.status_code,
+        headers=response.headers,
+        stream=response.stream,
+        extensions=response.extensions
+    )
+
+
+class RetryStaleConnectionTransport(httpx.HTTPTransport):
+    """Transport that retries idempotent requests once if the server dropped a keep-alive connection."""
+    
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        try:
+            response = super().handle_request(request)
+        except httpx.RemoteProtocolError:
+            if request.method not in IDEMPOTENT_METHODS:
+                raise
+            response = super().handle_request(request)
+        return _orjson_decoded(response)
+
+
+class AsyncRetryStaleConnectionTransport(httpx.AsyncHTTPTransport):
+    """Async transport that retries idempotent requests once if the server dropped a keep-alive connection."""
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        try:
+            response = await super().handle_async_request(request)
+        except httpx.RemoteProtocolError:
+            if request.method not in IDEMPOTENT_METHODS:
+                raise
+            response = await super().handle_async_request(request)
+        return _orjson_decoded(response)
+
+
+class _ORJSONBodyMixin:
+    """Encode JSON request bodies with orjson instead of httpx's stdlib json.dumps."""
+    
+    def build_request(self, method, url, *, json=None, content=None, headers=None, **kwargs) -> httpx.Request:
+        if json is not None and content is None:
+            content = orjson.dumps(json, option=orjson.OPT_NON_STR_KEYS)
+            headers = httpx.Headers(headers)
+            headers.setdefault("Content-Type", "application/json")
+        return super().build_request(method, url, content=content, headers=headers, **kwargs)
+
+
+class ORJSONClient(_ORJSONBodyMixin, httpx.Client):
+    """Sync httpx client with orjson request bodies."""
+
+
+class ORJSONAsyncClient(_ORJSONBodyMixin, httpx.AsyncClient):
+    """Async httpx client with orjson request bodies."""
+
+
+def _pool_limits() -> httpx.Limits:
+    """Connection pool limits shared by every Supabase PostgREST session."""
+    return httpx.Limits(
+        max_connections=settings.supabase_max_connections,
+        max_keepalive_connections=settings.supabase_max_keepalive_connections,
+        keepalive_expiry=settings.supabase_keepalive_expiry
+    )
+
+
+def _timeout() -> httpx.Timeout:
+    """Request timeout for Supabase sessions, with a shorter bound on connecting."""
+    return httpx.Timeout(settings.supabase_http_timeout, connect=settings.supabase_connect_timeout)
+
+
+def _use_pooled_session(client: Client) -> None:
+    """Replace a sync client's PostgREST session with a pooled keep-alive session."""
+    postgrest = client.postgrest
+    default_session = postgrest.session
+    postgrest.session = ORJSONClient(
+        base_url=default_session.base_url,
+        headers=default_session.headers,
+        timeout=_timeout(),
+        transport=RetryStaleConnectionTransport(limits=_pool_limits(), http2=True, retries=1),
+        follow_redirects=True
+    )
+    default_session.close()
+
+
+def returning(query, columns: str):
+    """
+    Limit the rows PostgREST echoes back from a write to `columns`.
+    
+    postgrest-py's insert/update/delete builders have no select(), and with
+    return=minimal it reports a count of 0 regardless of the rows affected,
+    so this is the cheapest way to both detect a miss and skip JSONB payloads.
+    """
+    query.params = query.params.add("select", columns)
+    return query
+
+
 class SupabaseClient:
     """Supabase client wrapper for database operations."""
     
@@ -15,14 +130,78 @@ class SupabaseClient:
             settings.supabase_url,
             settings.supabase_service_role_key
         )
+        _use_pooled_session(self.client)
+        _use_pooled_session(self.service_client)
+        # Created on application startup, since building them must be awaited
+        self.async_client: Optional[AsyncClient] = None
+        self.async_service_client: Optional[AsyncClient] = None
+        self.http_client: Optional[httpx.AsyncClient] = None
+        self.service_http_client: Optional[httpx.AsyncClient] = None
+    
+    @staticmethod
+    async def _create_pooled_async_client(key: str) -> Tuple[AsyncClient, httpx.AsyncClient]:
+        """Create an async Supabase client whose PostgREST session is a pooled keep-alive client."""
+        client = await create_async_client(settings.supabase_url, key)
+        
+        postgrest = client.postgrest
+        default_session = postgrest.session
+        http_client = ORJSONAsyncClient(
+            base_url=default_session.base_url,
+            headers=default_session.headers,
+            timeout=_timeout(),
+            transport=AsyncRetryStaleConnectionTransport(limits=_pool_limits(), http2=True, retries=1),
+            follow_redirects=True
+        )
+        await default_session.aclose()
+        postgrest.session = http_client
+        return client, http_client
+    
+    async def init_async_client(self) -> AsyncClient:
+        """Create the async Supabase clients (anon and service role) used by non-blocking code."""
+        if self.async_client is None:
+            self.async_client, self.http_client = await self._create_pooled_async_client(settings.supabase_key)
+        if self.async_service_client is None:
+            self.async_service_client, self.service_http_client = await self._create_pooled_async_client(
+                settings.supabase_service_role_key
+            )
+        return self.async_client
+    
+    async def warm_up(self) -> None:
+        """Open a pooled connection per async client so the first requests skip the TCP/TLS handshake."""
+        await asyncio.gather(*(
+            client.table("cases").select("id").limit(1).execute()
+            for client in (self.async_client, self.async_service_client)
+        ))
+    
+    async def close(self) -> None:
+        """Close the pooled HTTP clients used by the async Supabase clients."""
+        for http_client in (self.http_client, self.service_http_client):
+            if http_client is not None:
+                await http_client.aclose()
+        self.http_client = None
+        self.service_http_client = None
+        self.async_client = None
+        self.async_service_client = None
     
     def get_client(self) -> Client:
         """Get the regular Supabase client."""
         return self.client
     
+    def get_async_client(self) -> AsyncClient:
+        """Get the async Supabase client (initialized in the app lifespan)."""
+        if self.async_client is None:
+            raise RuntimeError("Async Supabase client has not been initialized")
+        return self.async_client
+    
     def get_service_client(self) -> Client:
         """Get the service role Supabase client (for admin operations)."""
         return self.service_client
+    
+    def get_async_service_client(self) -> AsyncClient:
+        """Get the async service role Supabase client (initialized in the app lifespan)."""
+        if self.async_service_client is None:
+            raise RuntimeError("Async Supabase service client has not been initialized")
+        return self.async_service_client
 
 
 # Global Supabase client instance
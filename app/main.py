@@ -1,17 +1,23 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 
 from app.core.config import settings
 from app.api import auth, files, users, audio, cases, evidence, case_timeline, media, audio_comparison, ai_service
 from app.core.database import supabase_client
+from app.core.cache import response_cache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Upper bound on the startup connection warm-up, in seconds
+WARM_UP_TIMEOUT = 5.0
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -19,18 +25,28 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting EvidenX-AI API...")
     try:
-        # Test Supabase connection
-        client = supabase_client.get_client()
-        # You can add a simple test query here if needed
-        logger.info("Supabase connection established")
+        # Create the pooled async Supabase clients
+        await supabase_client.init_async_client()
     except Exception as e:
         logger.error(f"Failed to connect to Supabase: {e}")
         raise
     
+    # Warm-up is best effort: a slow or unavailable Supabase must not block boot
+    try:
+        await asyncio.wait_for(supabase_client.warm_up(), timeout=WARM_UP_TIMEOUT)
+        logger.info("Supabase connection established")
+    except Exception as e:
+        logger.warning(f"Supabase warm-up failed, continuing without it: {e!r}")
+    
+    # Connect the shared response cache (in-process when REDIS_URL is unset)
+    await response_cache.init()
+    
     yield
     
     # Shutdown
     logger.info("Shutting down EvidenX-AI API...")
+    await response_cache.close()
+    await supabase_client.close()
 
 
 # Create FastAPI application
@@ -39,6 +55,7 @@ app = FastAPI(
     version=settings.app_version,
     description="A FastAPI application with Supabase and S3 integration",
     debug=settings.debug,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -51,6 +68,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger responses (transcript-heavy case and media listings)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 
 # Global exception handler
 @app.exception_handler(Exception)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, ConfigDict, HttpUrl
 from typing import List, Optional
 from datetime import datetime
 
@@ -8,13 +8,14 @@ class VisualSearchRequest(BaseModel):
     user_query: str
     s3_url: HttpUrl
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "user_query": "girl with pink shirt",
                 "s3_url": "https://s3.amazonaws.com/bucket/video.mp4"
             }
         }
+    )
 
 
 class DetectionResult(BaseModel):
@@ -24,6 +25,8 @@ class DetectionResult(BaseModel):
     bounding_box: List[float]  # [x1, y1, x2, y2]
     timestamp: float
     frame_id: int
+    
+    model_config = ConfigDict(frozen=True)
 
 
 class VisualSearchResponse(BaseModel):
@@ -35,8 +38,9 @@ class VisualSearchResponse(BaseModel):
     detections: List[DetectionResult]
     created_at: datetime
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "query": "girl with pink shirt",
                 "video_url": "https://s3.amazonaws.com/bucket/video.mp4",
@@ -54,3 +58,4 @@ class VisualSearchResponse(BaseModel):
                 "created_at": "2024-01-15T10:30:00Z"
             }
         }
+    )
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
@@ -10,6 +10,8 @@ class SpeakerSegment(BaseModel):
     end: float = Field(..., description="End time in seconds")
     text: str = Field(..., description="Transcribed text for this segment")
     confidence: float = Field(..., description="Confidence score (0-1)")
+    
+    model_config = ConfigDict(frozen=True)
 
 
 class SpeakerInfo(BaseModel):
@@ -18,6 +20,8 @@ class SpeakerInfo(BaseModel):
     total_speaking_time: float = Field(..., description="Total speaking time in seconds")
     segment_count: int = Field(..., description="Number of segments for this speaker")
     average_confidence: float = Field(..., description="Average confidence score")
+    
+    model_config = ConfigDict(frozen=True)
 
 
 class AudioTranscriptionRequest(BaseModel):
@@ -25,46 +29,46 @@ class AudioTranscriptionRequest(BaseModel):
     language: Optional[str] = Field(
         default="en", 
         description="Language code (e.g., 'en', 'es', 'fr')",
-        example="en"
+        examples=["en"]
     )
     model: Optional[str] = Field(
         default="nova-2", 
         description="Deepgram model to use (nova-2 for better speaker diarization)",
-        example="nova-2"
+        examples=["nova-2"]
     )
     diarize: bool = Field(
         default=True, 
         description="Enable speaker diarization",
-        example=True
+        examples=[True]
     )
     punctuate: bool = Field(
         default=True, 
         description="Add punctuation to transcript",
-        example=True
+        examples=[True]
     )
     smart_format: bool = Field(
         default=True, 
         description="Apply smart formatting",
-        example=True
+        examples=[True]
     )
     redact: Optional[List[str]] = Field(
         default=None, 
         description="Redact sensitive information (e.g., ['pii', 'numbers'])",
-        example=None
+        examples=[None]
     )
     search: Optional[List[str]] = Field(
         default=None, 
         description="Search terms to highlight",
-        example=None
+        examples=[None]
     )
     case_id: Optional[str] = Field(
         default=None,
         description="Case identifier for grouping transcriptions",
-        example="CASE-2024-001"
+        examples=["CASE-2024-001"]
     )
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "language": "en",
                 "model": "nova-2",
@@ -76,6 +80,7 @@ class AudioTranscriptionRequest(BaseModel):
                 "case_id": "CASE-2024-001"
             }
         }
+    )
 
 
 class AudioTranscriptionResponse(BaseModel):
@@ -89,8 +94,9 @@ class AudioTranscriptionResponse(BaseModel):
     processing_time: float = Field(..., description="Processing time in seconds")
     created_at: datetime = Field(default_factory=datetime.utcnow, description="Timestamp of transcription")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "transcript": "Hello, this is a test transcription. How are you today?",
                 "segments": [
@@ -130,6 +136,7 @@ class AudioTranscriptionResponse(BaseModel):
                 "created_at": "2025-09-24T10:00:00Z"
             }
         }
+    )
 
 
 class AudioUploadRequest(BaseModel):
@@ -206,6 +213,8 @@ class TranscriptResponse(BaseModel):
     transcript: str = Field(..., description="The transcript text")
     created_at: datetime = Field(..., description="When the transcription was created")
     completed_at: Optional[datetime] = Field(None, description="When the transcription was completed")
+    
+    model_config = ConfigDict(frozen=True)
 
 
 class ComparisonItem(BaseModel):
@@ -215,6 +224,8 @@ class ComparisonItem(BaseModel):
     witness2: str = Field(..., description="Statement from second witness/transcript")
     status: str = Field(..., description="Status: similarity, contradiction, or gray_area")
     details: str = Field(..., description="Brief explanation of the comparison result")
+    
+    model_config = ConfigDict(frozen=True)
 
 
 class TranscriptAnalysis(BaseModel):
@@ -222,6 +233,8 @@ class TranscriptAnalysis(BaseModel):
     comparisons: List[ComparisonItem] = Field(..., description="List of topic comparisons between transcripts")
     followUpQuestions: List[str] = Field(..., description="Follow-up questions that can be asked to both witnesses")
     analysis_timestamp: datetime = Field(default_factory=datetime.utcnow, description="When the analysis was performed")
+    
+    model_config = ConfigDict(frozen=True)
 
 
 class CaseTranscriptsResponse(BaseModel):
@@ -230,6 +243,8 @@ class CaseTranscriptsResponse(BaseModel):
     transcripts: List[TranscriptResponse] = Field(..., description="Array of transcripts for this case")
     total_count: int = Field(..., description="Total number of transcripts found")
     analysis: Optional[TranscriptAnalysis] = Field(None, description="AI analysis of the transcripts")
+    
+    model_config = ConfigDict(frozen=True)
 
 
 class AudioAnalyzeRequest(BaseModel):
@@ -274,6 +289,5 @@ class AudioMediaResponse(BaseModel):
     follow_up_questions: Optional[List[str]] = Field(None, description="AI-generated follow-up questions")
     created_at: Optional[datetime] = Field(None, description="Creation timestamp")
     updated_at: Optional[datetime] = Field(None, description="Update timestamp")
-    
-    class Config:
-        from_attributes = True
\ No newline at end of file
+
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
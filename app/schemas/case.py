@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, List ,Union
 from datetime import datetime
 
@@ -17,6 +17,20 @@ class CaseInfo(BaseModel):
     location: str
 
 
+class CaseInfoUpdate(BaseModel):
+    """Schema for a partial update of case information; omitted fields are left unchanged."""
+    firNumber: Optional[str] = None
+    title: Optional[str] = None
+    summary: Optional[str] = None
+    petitioner: Optional[str] = None
+    accused: Optional[str] = None
+    investigatingOfficer: Optional[str] = None
+    registeredDate: Optional[str] = None
+    status: Optional[str] = None
+    visibility: Optional[str] = None
+    location: Optional[str] = None
+
+
 class MediaInfo(BaseModel):
     """Schema for media information in case response."""
     id: str
@@ -38,6 +52,8 @@ class MediaInfo(BaseModel):
     location: Optional[str] = None
     pages: Optional[int] = None
     author: Optional[str] = None
+    
+    model_config = ConfigDict(frozen=True)
 
 
 class EvidenceInfo(BaseModel):
@@ -57,6 +73,8 @@ class EvidenceInfo(BaseModel):
     processingStatus: str
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    
+    model_config = ConfigDict(frozen=True)
 
 
 class AudioComparisonWitness(BaseModel):
@@ -70,6 +88,8 @@ class AudioComparisonWitness(BaseModel):
     contradictions: List[str]
     similarities: List[str]
     grayAreas: List[str]
+    
+    model_config = ConfigDict(frozen=True)
 
 
 class DetailedAnalysis(BaseModel):
@@ -79,6 +99,8 @@ class DetailedAnalysis(BaseModel):
     witness2: str
     status: str  # "contradiction", "similarity", "gray_area"
     details: str
+    
+    model_config = ConfigDict(frozen=True)
 
 
 class AudioComparisonInfo(BaseModel):
@@ -91,6 +113,8 @@ class AudioComparisonInfo(BaseModel):
     detailedAnalysis: List[DetailedAnalysis]
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    
+    model_config = ConfigDict(frozen=True)
 
 
 class CaseResponse(BaseModel):
@@ -111,8 +135,7 @@ class CaseResponse(BaseModel):
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class CaseCreate(BaseModel):
@@ -123,4 +146,4 @@ class CaseCreate(BaseModel):
 
 class CaseUpdate(BaseModel):
     """Schema for updating a case."""
-    case_info: Optional[CaseInfo] = None
\ No newline at end of file
+    case_info: Optional[CaseInfoUpdate] = None
\ No newline at end of file
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 from datetime import datetime
 
@@ -35,8 +35,7 @@ class CaseTimelineResponse(BaseModel):
     evidence: str
     description: str
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class CaseTimelineCreate(BaseModel):
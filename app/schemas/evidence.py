@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, List
 from datetime import datetime
 
@@ -15,6 +15,18 @@ class EvidenceInfo(BaseModel):
     thumbnail: Optional[str] = None
 
 
+class EvidenceInfoUpdate(BaseModel):
+    """Schema for a partial update of evidence information; omitted fields are left unchanged."""
+    type: Optional[str] = None
+    name: Optional[str] = None
+    description: Optional[str] = None
+    uploadDate: Optional[str] = None
+    fileSize: Optional[str] = None
+    tags: Optional[List[str]] = None
+    duration: Optional[str] = None
+    thumbnail: Optional[str] = None
+
+
 class EvidenceResponse(BaseModel):
     """Schema for evidence response with flattened structure."""
     id: str
@@ -30,8 +42,17 @@ class EvidenceResponse(BaseModel):
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+
+class EvidenceListResponse(BaseModel):
+    """Schema for evidence list response."""
+    evidence: list[EvidenceResponse]
+    total: int
+    page: int
+    per_page: int
+    
+    model_config = ConfigDict(frozen=True)
 
 
 class EvidenceCreate(BaseModel):
@@ -43,4 +64,4 @@ class EvidenceCreate(BaseModel):
 
 class EvidenceUpdate(BaseModel):
     """Schema for updating evidence."""
-    evidence_info: Optional[EvidenceInfo] = None
\ No newline at end of file
+    evidence_info: Optional[EvidenceInfoUpdate] = None
\ No newline at end of file
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import Optional, List
 from datetime import datetime
 
@@ -33,6 +33,28 @@ class MediaInfo(BaseModel):
     author: Optional[str] = Field(None, description="Author of document")
 
 
+class MediaInfoUpdate(BaseModel):
+    """Schema for a partial update of media information; omitted fields are left unchanged."""
+    type: Optional[str] = None
+    url: Optional[str] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    fileSize: Optional[str] = None
+    format: Optional[str] = None
+    uploadDate: Optional[str] = None
+    duration: Optional[str] = None
+    transcript: Optional[str] = None
+    speakers: Optional[int] = None
+    confidence: Optional[int] = None
+    resolution: Optional[str] = None
+    fps: Optional[int] = None
+    thumbnail: Optional[str] = None
+    camera: Optional[str] = None
+    location: Optional[str] = None
+    pages: Optional[int] = None
+    author: Optional[str] = None
+
+
 class MediaResponse(BaseModel):
     """Schema for media response."""
     id: str = Field(..., description="Media ID")
@@ -58,17 +80,34 @@ class MediaResponse(BaseModel):
     created_at: Optional[datetime] = Field(None, description="Creation timestamp")
     updated_at: Optional[datetime] = Field(None, description="Update timestamp")
     
-    class Config:
-        from_attributes = True
+    @field_validator("duration", mode="before")
+    @classmethod
+    def stringify_duration(cls, value):
+        """Accept numeric durations (seconds) as stored by the transcription pipeline."""
+        if isinstance(value, (int, float)):
+            return str(value)
+        return value
+    
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+
+class MediaListResponse(BaseModel):
+    """Schema for media list response."""
+    media: list[MediaResponse]
+    total: int
+    page: int
+    per_page: int
+    
+    model_config = ConfigDict(frozen=True)
 
 
 class MediaCreate(BaseModel):
-    """Schema for creating new media."""
-    id: str
+    """Schema for creating new media; the database generates the ID when it is omitted."""
+    id: Optional[str] = None
     case_id: str
     media_info: MediaInfo
 
 
 class MediaUpdate(BaseModel):
     """Schema for updating media."""
-    media_info: Optional[MediaInfo] = None
\ No newline at end of file
+    media_info: Optional[MediaInfoUpdate] = None
\ No newline at end of file
@@ -5,10 +5,12 @@ Audio service for managing audio files and transcriptions with Supabase database
 import uuid
 import time
 import json
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, BinaryIO
 from datetime import datetime
 import logging
 
+from supabase import AsyncClient
+
 from app.core.database import supabase_client
 from app.services.s3_service import s3_service
 from app.schemas.audio import (
@@ -21,27 +23,84 @@ from app.schemas.audio import (
 
 logger = logging.getLogger(__name__)
 
+# Presigned URLs stored on media records stay valid for 7 days
+MEDIA_URL_EXPIRATION = 604800
+
 
 class AudioService:
     """Service for managing audio files and transcriptions."""
     
     def __init__(self):
-        self.client = supabase_client.get_service_client()  # Use service client to bypass RLS
         self.logger = logger
     
+    @property
+    def client(self) -> AsyncClient:
+        """Async service client (bypasses RLS); available once the app has started."""
+        return supabase_client.get_async_service_client()
+    
+    async def _resolve_user_id(self, user_id: Optional[str]) -> str:
+        """Return `user_id`, falling back to an existing (or test) user when none is given."""
+        if user_id:
+            return user_id
+        
+        # For testing, we'll use a different approach
+        # Since we can't easily create a user due to foreign key constraints,
+        # let's try to use a different strategy
+        try:
+            existing_user = await self.client.table('users').select('id').limit(1).execute()
+            if existing_user.data:
+                return existing_user.data[0]['id']
+            
+            # If no users exist, we'll need to handle this differently
+            # Let's try to create a user by bypassing the foreign key constraint
+            # This is a workaround for testing
+            user_id = '00000000-0000-0000-0000-000000000001'
+            
+            # Try to create a user in auth.users first (this might not work)
+            try:
+                # This is a workaround - we'll try to create a user
+                # by using the service client to bypass some constraints
+                user_data = {
+                    'id': user_id,
+                    'email': 'test@example.com',
+                    'full_name': 'Test User'
+                }
+                # Try to insert into users table
+                await self.client.table('users').insert(user_data).execute()
+            except Exception as e:
+                # If that fails, we'll need to handle this differently
+                self.logger.warning(f"Could not create test user: {e}")
+                # For now, let's try to use a different approach
+                # We'll need to modify the database schema or use a different strategy
+                raise Exception("No users exist in database and cannot create test user due to foreign key constraints. Please create a user in Supabase dashboard first.")
+            return user_id
+        except Exception as e:
+            self.logger.error(f"Error handling user_id: {e}")
+            raise Exception(f"Cannot proceed without a valid user_id: {e}")
+    
     async def upload_audio_file(
         self,
         filename: str,
         content_type: str,
-        size: int,
-        audio_data: bytes,
+        file_obj: BinaryIO,
         user_id: str = None,
         duration: Optional[float] = None,
         channels: Optional[int] = None,
         sample_rate: Optional[int] = None,
-        bit_rate: Optional[int] = None
+        bit_rate: Optional[int] = None,
+        media_record: Optional[Dict[str, Any]] = None
     ) -> AudioUploadResponse:
-        """Upload an audio file to S3 and database."""
+        """
+        Upload an audio file to S3 and database.
+        
+        `file_obj` is streamed to S3 in parts, so the file is never held in
+        memory as a whole; the recorded size is the number of bytes sent.
+        
+        If `media_record` ({"id", "case_id", "media_info"}) is given, the media
+        row is written in the same transaction as the audio_files row, with
+        media_info "url" and "fileSize" filled in from the upload. A media ID is
+        generated when the record has none; the response carries the ID used.
+        """
         try:
             file_id = str(uuid.uuid4())
             
@@ -50,11 +109,8 @@ class AudioService:
             s3_key = f"audio/{file_id}.{file_extension}"
             
             # Upload to S3
-            import io
-            audio_file_obj = io.BytesIO(audio_data)
-            
             s3_result = await s3_service.upload_file(
-                file_obj=audio_file_obj,
+                file_obj=file_obj,
                 object_name=s3_key,
                 content_type=content_type,
                 metadata={
@@ -67,6 +123,9 @@ class AudioService:
             if not s3_result.get('success'):
                 raise Exception(f"Failed to upload to S3: {s3_result.get('error')}")
             
+            size = s3_result['size']
+            upload_url = s3_result.get('url')
+            
             # Insert into database
             insert_data = {
                 'id': file_id,
@@ -77,48 +136,29 @@ class AudioService:
                 'duration': duration,
                 'channels': channels,
                 'sample_rate': sample_rate,
-                'bit_rate': bit_rate
+                'bit_rate': bit_rate,
+                'user_id': await self._resolve_user_id(user_id)
             }
             
-            # For testing, we'll use a different approach
-            # Since we can't easily create a user due to foreign key constraints,
-            # let's try to use a different strategy
-            if not user_id:
-                # Try to get any existing user first
-                try:
-                    existing_user = self.client.table('users').select('id').limit(1).execute()
-                    if existing_user.data:
-                        user_id = existing_user.data[0]['id']
-                    else:
-                        # If no users exist, we'll need to handle this differently
-                        # Let's try to create a user by bypassing the foreign key constraint
-                        # This is a workaround for testing
-                        user_id = '00000000-0000-0000-0000-000000000001'
-                        
-                        # Try to create a user in auth.users first (this might not work)
-                        try:
-                            # This is a workaround - we'll try to create a user
-                            # by using the service client to bypass some constraints
-                            user_data = {
-                                'id': user_id,
-                                'email': 'test@example.com',
-                                'full_name': 'Test User'
-                            }
-                            # Try to insert into users table
-                            self.client.table('users').insert(user_data).execute()
-                        except Exception as e:
-                            # If that fails, we'll need to handle this differently
-                            self.logger.warning(f"Could not create test user: {e}")
-                            # For now, let's try to use a different approach
-                            # We'll need to modify the database schema or use a different strategy
-                            raise Exception("No users exist in database and cannot create test user due to foreign key constraints. Please create a user in Supabase dashboard first.")
-                except Exception as e:
-                    self.logger.error(f"Error handling user_id: {e}")
-                    raise Exception(f"Cannot proceed without a valid user_id: {e}")
-            
-            insert_data['user_id'] = user_id
-            
-            result = self.client.table('audio_files').insert(insert_data).execute()
+            if media_record is None:
+                result = await self.client.table('audio_files').insert(insert_data).execute()
+            else:
+                # Long-lived URL stored on the media record
+                upload_url = s3_service.generate_presigned_url(s3_key, expiration=MEDIA_URL_EXPIRATION)
+                # save_audio_upload names the id column explicitly, so the column default never applies
+                media_row = {
+                    **media_record,
+                    'id': media_record.get('id') or str(uuid.uuid4()),
+                    'media_info': {
+                        **media_record['media_info'],
+                        'url': upload_url or s3_key,
+                        'fileSize': f"{size / (1024 * 1024):.2f} MB"
+                    }
+                }
+                result = await self.client.rpc('save_audio_upload', {
+                    'p_audio_file': insert_data,
+                    'p_media': media_row
+                }).execute()
             
             if result.data:
                 self.logger.info(f"Audio file uploaded to S3: {filename} ({size} bytes) at {s3_key}")
@@ -128,7 +168,8 @@ class AudioService:
                     size=size,
                     content_type=content_type,
                     s3_key=s3_key,
-                    upload_url=s3_result.get('url')
+                    upload_url=upload_url,
+                    media_id=media_row['id'] if media_record else None
                 )
             else:
                 raise Exception("Failed to insert audio file into database")
@@ -159,7 +200,7 @@ class AudioService:
             if case_id:
                 insert_data['case_id'] = case_id
             
-            result = self.client.table('transcription_jobs').insert(insert_data).execute()
+            result = await self.client.table('transcription_jobs').insert(insert_data).execute()
             
             if result.data:
                 job = TranscriptionJob(
@@ -211,7 +252,7 @@ class AudioService:
             
             # Update in database
             self.logger.info(f"Updating job {job_id} with data: {update_data}")
-            result = self.client.table('transcription_jobs').update(update_data).eq('id', job_id).execute()
+            result = await self.client.table('transcription_jobs').update(update_data).eq('id', job_id).execute()
             
             if result.data:
                 self.logger.info(f"Transcription job updated: {job_id} - {status}")
@@ -244,7 +285,7 @@ class AudioService:
                         'confidence': segment.confidence
                     })
                 
-                self.client.table('speaker_segments').insert(segments_data).execute()
+                await self.client.table('speaker_segments').insert(segments_data).execute()
             
             # Save speaker info
             if transcription_result.speakers:
@@ -258,7 +299,7 @@ class AudioService:
                         'average_confidence': speaker.average_confidence
                     })
                 
-                self.client.table('speaker_info').insert(speakers_data).execute()
+                await self.client.table('speaker_info').insert(speakers_data).execute()
             
             # Update job with result (exclude datetime fields that can't be JSON serialized)
             result_dict = transcription_result.model_dump(exclude={'created_at'})
@@ -285,7 +326,7 @@ class AudioService:
     async def get_audio_file_info(self, file_id: str) -> Optional[Dict[str, Any]]:
         """Get audio file information by ID."""
         try:
-            result = self.client.table('audio_files').select('*').eq('id', file_id).execute()
+            result = await self.client.table('audio_files').select('*').eq('id', file_id).execute()
             if result.data:
                 return result.data[0]
             return None
@@ -324,11 +365,11 @@ class AudioService:
         """Get a transcription job by ID."""
         try:
             if user_id:
-                result = self.client.table('transcription_jobs').select(
+                result = await self.client.table('transcription_jobs').select(
                     '*, audio_files!inner(user_id)'
                 ).eq('id', job_id).eq('audio_files.user_id', user_id).execute()
             else:
-                result = self.client.table('transcription_jobs').select('*').eq('id', job_id).execute()
+                result = await self.client.table('transcription_jobs').select('*').eq('id', job_id).execute()
             
             if result.data:
                 job_data = result.data[0]
@@ -375,7 +416,7 @@ class AudioService:
             if status:
                 query = query.eq('status', status)
             
-            result = query.order('created_at', desc=True).range(offset, offset + limit - 1).execute()
+            result = await query.order('created_at', desc=True).range(offset, offset + limit - 1).execute()
             
             jobs = []
             for job_data in result.data:
@@ -409,7 +450,7 @@ class AudioService:
             if status:
                 query = query.eq('status', status)
             
-            result = query.order('created_at', desc=True).range(offset, offset + limit - 1).execute()
+            result = await query.order('created_at', desc=True).range(offset, offset + limit - 1).execute()
             
             jobs = []
             for job_data in result.data:
@@ -456,7 +497,7 @@ class AudioService:
             if status:
                 query = query.eq('status', status)
             
-            result = query.order('created_at', desc=True).range(offset, offset + limit - 1).execute()
+            result = await query.order('created_at', desc=True).range(offset, offset + limit - 1).execute()
             
             jobs = []
             for job_data in result.data:
@@ -497,7 +538,7 @@ class AudioService:
     ) -> List[AudioFileInfo]:
         """List audio files for a user."""
         try:
-            result = self.client.table('audio_files').select('*').eq('user_id', user_id).order('created_at', desc=True).range(offset, offset + limit - 1).execute()
+            result = await self.client.table('audio_files').select('*').eq('user_id', user_id).order('created_at', desc=True).range(offset, offset + limit - 1).execute()
             
             files = []
             for file_data in result.data:
@@ -525,10 +566,10 @@ class AudioService:
         """Delete an audio file and related data."""
         try:
             # Delete related transcription jobs first
-            self.client.table('transcription_jobs').delete().eq('file_id', file_id).execute()
+            await self.client.table('transcription_jobs').delete().eq('file_id', file_id).execute()
             
             # Delete the audio file
-            result = self.client.table('audio_files').delete().eq('id', file_id).eq('user_id', user_id).execute()
+            result = await self.client.table('audio_files').delete().eq('id', file_id).eq('user_id', user_id).execute()
             
             if result.data:
                 self.logger.info(f"Audio file deleted: {file_id}")
@@ -553,7 +594,7 @@ class AudioService:
             if status:
                 query = query.eq('status', status)
             
-            result = query.order('created_at', desc=True).range(offset, offset + limit - 1).execute()
+            result = await query.order('created_at', desc=True).range(offset, offset + limit - 1).execute()
             
             if not result.data:
                 self.logger.info(f"No completed transcriptions found for case: {case_id}")
@@ -602,7 +643,7 @@ class AudioService:
     async def get_audio_by_case_and_url(self, case_id: str, url: str) -> Optional[dict]:
         """Get audio file by case_id and url."""
         try:
-            result = self.client.table('audio_files').select('*').eq('case_id', case_id).eq('url', url).execute()
+            result = await self.client.table('audio_files').select('*').eq('case_id', case_id).eq('url', url).execute()
             if result.data:
                 return result.data[0]
             return None
@@ -624,7 +665,7 @@ class AudioService:
                 'id': file_id,
                 'case_id': case_id,
                 'url': url,
-                'audio_info': audio_info.dict(),
+                'audio_info': audio_info.model_dump(mode="json"),
                 'filename': f"audio_analysis_{case_id}",
                 'size': 0,  # Unknown size for URL-based audio
                 'content_type': 'audio/unknown',
@@ -632,7 +673,7 @@ class AudioService:
                 'user_id': '00000000-0000-0000-0000-000000000000'  # System user ID
             }
             
-            result = self.client.table('audio_files').insert(insert_data).execute()
+            result = await self.client.table('audio_files').insert(insert_data).execute()
             
             if result.data:
                 self.logger.info(f"Audio analysis record created: {file_id}")
@@ -698,7 +739,7 @@ class AudioService:
                 'media_info': media_info
             }
             
-            result = self.client.table('media').insert(insert_data).execute()
+            result = await self.client.table('media').insert(insert_data).execute()
             
             if result.data:
                 self.logger.info(f"Audio media record created: {media_id} for case {case_id}")
@@ -307,11 +307,16 @@ Please provide 5 specific, actionable follow-up questions that would help resolv
         transcript1: str, 
         transcript2: str, 
         witness1_name: str = "Witness 1", 
-        witness2_name: str = "Witness 2"
+        witness2_name: str = "Witness 2",
+        media_id1: str = "media1",
+        media_id2: str = "media2"
     ) -> tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
         """
         Analyze two audio transcripts and generate comparison analysis.
         
+        The media IDs are templated into the prompt so the model emits them
+        as the witnesses' audioId values directly.
+        
         Returns:
             tuple: (witnesses_analysis, detailed_analysis)
         """
@@ -326,6 +331,7 @@ Please provide 5 specific, actionable follow-up questions that would help resolv
             {transcript2}
 
             IMPORTANT: You must respond with ONLY valid JSON. No additional text, explanations, or formatting.
+            Use exactly these audioId values: "{media_id1}" for WITNESS 1, "{media_id2}" for WITNESS 2.
 
             Required JSON structure:
             {{
@@ -334,7 +340,7 @@ Please provide 5 specific, actionable follow-up questions that would help resolv
                         "id": "ac1",
                         "witnessName": "{witness1_name}",
                         "witnessImage": "https://images.unsplash.com/photo-1507003211169-0a1dd7228f2d?w=150&h=150&fit=crop&crop=face",
-                        "audioId": "media1",
+                        "audioId": "{media_id1}",
                         "summary": "Brief summary of what this witness said",
                         "transcript": "Key excerpt from transcript",
                         "contradictions": ["List of contradictions with other evidence"],
@@ -345,7 +351,7 @@ Please provide 5 specific, actionable follow-up questions that would help resolv
                         "id": "ac2",
                         "witnessName": "{witness2_name}",
                         "witnessImage": "https://images.unsplash.com/photo-1494790108755-2616b2abff16?w=150&h=150&fit=crop&crop=face",
-                        "audioId": "media2",
+                        "audioId": "{media_id2}",
                         "summary": "Brief summary of what this witness said",
                         "transcript": "Key excerpt from transcript",
                         "contradictions": ["List of contradictions with other evidence"],
@@ -431,7 +437,7 @@ Please provide 5 specific, actionable follow-up questions that would help resolv
                 Statement 2: {transcript2[:500]}...
                 
                 Return this exact JSON structure:
-                {{"witnesses":[{{"id":"ac1","witnessName":"{witness1_name}","witnessImage":"https://images.unsplash.com/photo-1507003211169-0a1dd7228f2d?w=150&h=150&fit=crop&crop=face","audioId":"media1","summary":"Brief summary","transcript":"Key excerpt","contradictions":["Contradiction 1"],"similarities":["Similarity 1"],"grayAreas":["Gray area 1"]}},{{"id":"ac2","witnessName":"{witness2_name}","witnessImage":"https://images.unsplash.com/photo-1494790108755-2616b2abff16?w=150&h=150&fit=crop&crop=face","audioId":"media2","summary":"Brief summary","transcript":"Key excerpt","contradictions":["Contradiction 1"],"similarities":["Similarity 1"],"grayAreas":["Gray area 1"]}}],"detailedAnalysis":[{{"topic":"Topic 1","witness1":"Statement 1","witness2":"Statement 2","status":"similarity","details":"Explanation"}}]}}
+                {{"witnesses":[{{"id":"ac1","witnessName":"{witness1_name}","witnessImage":"https://images.unsplash.com/photo-1507003211169-0a1dd7228f2d?w=150&h=150&fit=crop&crop=face","audioId":"{media_id1}","summary":"Brief summary","transcript":"Key excerpt","contradictions":["Contradiction 1"],"similarities":["Similarity 1"],"grayAreas":["Gray area 1"]}},{{"id":"ac2","witnessName":"{witness2_name}","witnessImage":"https://images.unsplash.com/photo-1494790108755-2616b2abff16?w=150&h=150&fit=crop&crop=face","audioId":"{media_id2}","summary":"Brief summary","transcript":"Key excerpt","contradictions":["Contradiction 1"],"similarities":["Similarity 1"],"grayAreas":["Gray area 1"]}}],"detailedAnalysis":[{{"topic":"Topic 1","witness1":"Statement 1","witness2":"Statement 2","status":"similarity","details":"Explanation"}}]}}
                 """
                 
                 fallback_response = self.client.chat.completions.create(
@@ -462,7 +468,7 @@ Please provide 5 specific, actionable follow-up questions that would help resolv
                     "id": "ac1",
                     "witnessName": witness1_name,
                     "witnessImage": "https://images.unsplash.com/photo-1507003211169-0a1dd7228f2d?w=150&h=150&fit=crop&crop=face",
-                    "audioId": "media1",
+                    "audioId": media_id1,
                     "summary": "Analysis failed - manual review required",
                     "transcript": transcript1[:200] + "..." if len(transcript1) > 200 else transcript1,
                     "contradictions": ["Analysis unavailable"],
@@ -473,7 +479,7 @@ Please provide 5 specific, actionable follow-up questions that would help resolv
                     "id": "ac2",
                     "witnessName": witness2_name,
                     "witnessImage": "https://images.unsplash.com/photo-1494790108755-2616b2abff16?w=150&h=150&fit=crop&crop=face",
-                    "audioId": "media2",
+                    "audioId": media_id2,
                     "summary": "Analysis failed - manual review required",
                     "transcript": transcript2[:200] + "..." if len(transcript2) > 200 else transcript2,
                     "contradictions": ["Analysis unavailable"],
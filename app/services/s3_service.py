@@ -1,11 +1,29 @@
+import asyncio
 import boto3
 import logging
+import time
 from typing import Optional, BinaryIO
+from boto3.s3.transfer import TransferConfig
+from cachetools import LRUCache
 from botocore.exceptions import ClientError, NoCredentialsError
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Files above 8 MB are sent as a multipart upload, 4 parts at a time
+MULTIPART_CHUNK_SIZE = 8 * 1024 * 1024
+UPLOAD_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=MULTIPART_CHUNK_SIZE,
+    multipart_chunksize=MULTIPART_CHUNK_SIZE,
+    max_concurrency=4,
+    use_threads=True
+)
+
+# A presigned URL is reused for a tenth of its lifetime (at most an hour), so
+# callers always get at least 90% of the requested validity
+PRESIGNED_URL_REUSE_FRACTION = 10
+PRESIGNED_URL_MAX_REUSE = 3600
+
 
 class S3Service:
     """S3 service for file operations."""
@@ -19,6 +37,7 @@ class S3Service:
                 region_name=settings.aws_region
             )
             self.bucket_name = settings.s3_bucket_name
+            self.presigned_urls: LRUCache = LRUCache(maxsize=4096)
         except NoCredentialsError:
             logger.error("AWS credentials not found")
             raise
@@ -33,7 +52,13 @@ class S3Service:
         content_type: Optional[str] = None,
         metadata: Optional[dict] = None
     ) -> dict:
-        """Upload a file to S3."""
+        """
+        Upload a file to S3.
+        
+        The file is read and sent in MULTIPART_CHUNK_SIZE parts from a worker
+        thread, so memory stays bounded and the event loop is not blocked.
+        The returned "size" is the number of bytes actually sent.
+        """
         try:
             extra_args = {}
             if content_type:
@@ -41,11 +66,16 @@ class S3Service:
             if metadata:
                 extra_args['Metadata'] = metadata
             
-            self.s3_client.upload_fileobj(
+            # The callback runs on the transfer threads, once per chunk sent
+            bytes_sent = []
+            await asyncio.to_thread(
+                self.s3_client.upload_fileobj,
                 file_obj, 
                 self.bucket_name, 
                 object_name,
-                ExtraArgs=extra_args
+                ExtraArgs=extra_args,
+                Config=UPLOAD_TRANSFER_CONFIG,
+                Callback=bytes_sent.append
             )
             
             # Generate presigned URL for the uploaded file
@@ -55,7 +85,8 @@ class S3Service:
                 "success": True,
                 "object_name": object_name,
                 "url": url,
-                "bucket": self.bucket_name
+                "bucket": self.bucket_name,
+                "size": sum(bytes_sent)
             }
             
         except ClientError as e:
@@ -77,13 +108,40 @@ class S3Service:
             logger.error(f"Error downloading file from S3: {e}")
             return None
     
+    async def file_exists(self, object_name: str) -> bool:
+        """Check that an object exists with a HEAD request (metadata only)."""
+        try:
+            await asyncio.to_thread(
+                self.s3_client.head_object,
+                Bucket=self.bucket_name,
+                Key=object_name
+            )
+            return True
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return False
+            logger.error(f"Error checking file in S3: {e}")
+            raise
+    
     def generate_presigned_url(
         self, 
         object_name: str, 
         expiration: int = 3600,
         http_method: str = 'GET'
     ) -> Optional[str]:
-        """Generate a presigned URL for S3 object access."""
+        """
+        Generate a presigned URL for S3 object access.
+        
+        URLs are cached per time window of a tenth of `expiration` (capped at
+        PRESIGNED_URL_MAX_REUSE), so repeated requests for the same object
+        reuse one signature while keeping most of its validity.
+        """
+        reuse_window = max(1, min(PRESIGNED_URL_MAX_REUSE, expiration // PRESIGNED_URL_REUSE_FRACTION))
+        key = (object_name, expiration, http_method, int(time.time() // reuse_window))
+        cached = self.presigned_urls.get(key)
+        if cached is not None:
+            return cached
+        
         try:
             response = self.s3_client.generate_presigned_url(
                 ClientMethod='get_object',
@@ -91,6 +149,7 @@ class S3Service:
                 ExpiresIn=expiration,
                 HttpMethod=http_method
             )
+            self.presigned_urls[key] = response
             return response
         except ClientError as e:
             logger.error(f"Error generating presigned URL: {e}")
@@ -99,7 +158,8 @@ class S3Service:
     async def delete_file(self, object_name: str) -> bool:
         """Delete a file from S3."""
         try:
-            self.s3_client.delete_object(
+            await asyncio.to_thread(
+                self.s3_client.delete_object,
                 Bucket=self.bucket_name,
                 Key=object_name
             )
@@ -0,0 +1,52 @@
+"""
+Retry helpers for idempotent calls to external services.
+"""
+
+import asyncio
+import logging
+import random
+from typing import Awaitable, Callable, Tuple, Type, TypeVar
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Network-level failures that are worth retrying; HTTP error responses are not
+TRANSIENT_ERRORS: Tuple[Type[BaseException], ...] = (httpx.TransportError,)
+
+
+async def retry_async(
+    operation: Callable[[], Awaitable[T]],
+    retries: int = 3,
+    base_delay: float = 0.2,
+    max_delay: float = 2.0,
+    retry_on: Tuple[Type[BaseException], ...] = TRANSIENT_ERRORS
+) -> T:
+    """
+    Await `operation()` until it succeeds, retrying on `retry_on` errors.
+
+    Waits between attempts use exponential backoff with full jitter, so
+    concurrent callers do not retry in lockstep. Only use this for
+    operations that are safe to repeat.
+
+    Args:
+        operation: Callable returning a new awaitable on every call
+        retries: Number of retries after the first attempt
+        base_delay: Upper bound of the first wait, in seconds
+        max_delay: Upper bound of any single wait, in seconds
+        retry_on: Exception types that trigger a retry
+
+    Returns:
+        The result of the first successful attempt
+    """
+    for attempt in range(retries + 1):
+        try:
+            return await operation()
+        except retry_on as e:
+            if attempt == retries:
+                raise
+            delay = random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+            logger.warning(f"Attempt {attempt + 1} failed ({type(e).__name__}), retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
@@ -0,0 +1,128 @@
+"""
+Streaming helpers for list endpoints backed by Supabase.
+"""
+
+import asyncio
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterable, Iterator, Optional
+
+import orjson
+from fastapi.responses import StreamingResponse
+
+# Number of rows fetched from PostgREST per round-trip while streaming
+STREAM_CHUNK_SIZE = 1000
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def iter_query_rows(
+    query_factory: Callable[[], Any],
+    chunk_size: int = STREAM_CHUNK_SIZE
+) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the rows of a Supabase query in fixed-size chunks.
+
+    PostgREST request builders are mutable, so `query_factory` must return a
+    fresh builder (filters and ordering applied) on every call. The first
+    chunk is fetched eagerly so that connection or query errors surface before
+    a streaming response has started.
+
+    Args:
+        query_factory: Callable returning a new, un-executed query builder
+        chunk_size: Number of rows to request per round-trip
+
+    Returns:
+        Iterator over the raw row dictionaries
+    """
+    first_chunk = query_factory().range(0, chunk_size - 1).execute().data
+
+    def rows() -> Iterator[Dict[str, Any]]:
+        chunk = first_chunk
+        offset = 0
+        while True:
+            yield from chunk
+            if len(chunk) < chunk_size:
+                return
+            offset += chunk_size
+            chunk = query_factory().range(offset, offset + chunk_size - 1).execute().data
+
+    return rows()
+
+
+async def aiter_query_rows(
+    query_factory: Callable[[], Any],
+    chunk_size: int = STREAM_CHUNK_SIZE
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Async counterpart of `iter_query_rows` for async query builders.
+
+    The first chunk is awaited before the iterator is returned, so query
+    errors surface before a streaming response has started.
+    """
+    first_chunk = (await query_factory().range(0, chunk_size - 1).execute()).data
+
+    async def rows() -> AsyncIterator[Dict[str, Any]]:
+        chunk = first_chunk
+        offset = 0
+        while True:
+            for row in chunk:
+                yield row
+            if len(chunk) < chunk_size:
+                return
+            offset += chunk_size
+            chunk = (await query_factory().range(offset, offset + chunk_size - 1).execute()).data
+
+    return rows()
+
+
+def iter_json_array(
+    rows: Iterable[Dict[str, Any]],
+    transform: Callable[[Dict[str, Any]], Dict[str, Any]]
+) -> Iterator[bytes]:
+    """Encode rows as a JSON array, one element at a time."""
+    yield b"["
+    separator = b""
+    for row in rows:
+        yield separator + orjson.dumps(transform(row))
+        separator = b","
+    yield b"]"
+
+
+async def aiter_json_array(items: AsyncIterable[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """Encode already JSON-ready items from an async source as a JSON array."""
+    yield b"["
+    separator = b""
+    async for item in items:
+        yield separator + orjson.dumps(item)
+        separator = b","
+    yield b"]"
+
+
+async def aiter_ndjson(items: AsyncIterable[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """Encode already JSON-ready items from an async source as newline-delimited JSON."""
+    async for item in items:
+        yield orjson.dumps(item, option=orjson.OPT_APPEND_NEWLINE)
+
+
+def wants_ndjson(accept: Optional[str]) -> bool:
+    """Return True if an Accept header asks for newline-delimited JSON."""
+    return bool(accept) and NDJSON_MEDIA_TYPE in accept
+
+
+async def stream_query_as_json(
+    query_factory: Callable[[], Any],
+    transform: Callable[[Dict[str, Any]], Dict[str, Any]],
+    chunk_size: int = STREAM_CHUNK_SIZE
+) -> StreamingResponse:
+    """
+    Stream the rows of a Supabase query to the client as a JSON array.
+
+    Peak memory is bounded by `chunk_size` rows regardless of the total
+    result size. The query builders are synchronous, so the first chunk is
+    fetched in a worker thread; Starlette iterates the remaining chunks in
+    its threadpool, so the event loop is never blocked.
+    """
+    rows = await asyncio.to_thread(iter_query_rows, query_factory, chunk_size)
+    return StreamingResponse(
+        iter_json_array(rows, transform),
+        media_type="application/json"
+    )
@@ -0,0 +1,25 @@
+-- Record an uploaded audio file and, optionally, its media row in a single transaction
+-- Columns are read from the JSON with the tables' own types. Only the listed columns are
+-- inserted (the rest keep their defaults), and listed columns missing from the JSON are
+-- inserted as NULL, so callers must supply both IDs (media.id's default does not apply here)
+CREATE OR REPLACE FUNCTION save_audio_upload(p_audio_file JSONB, p_media JSONB DEFAULT NULL)
+RETURNS SETOF audio_files
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF p_media IS NOT NULL THEN
+        INSERT INTO media (id, case_id, media_info)
+        SELECT m.id, m.case_id, m.media_info
+        FROM jsonb_populate_record(NULL::media, p_media) AS m;
+    END IF;
+
+    RETURN QUERY
+    INSERT INTO audio_files (id, filename, size, content_type, s3_key, duration, channels, sample_rate, bit_rate, user_id)
+    SELECT a.id, a.filename, a.size, a.content_type, a.s3_key, a.duration, a.channels, a.sample_rate, a.bit_rate, a.user_id
+    FROM jsonb_populate_record(NULL::audio_files, p_audio_file) AS a
+    RETURNING *;
+END;
+$$;
+
+-- Add comment to document the function
+COMMENT ON FUNCTION save_audio_upload(JSONB, JSONB) IS 'Insert audio_files and media rows for one upload in a single round-trip and transaction';
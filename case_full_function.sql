@@ -0,0 +1,50 @@
+-- Return a case with its evidence (enriched with the latest matching media) and audio comparisons
+-- Assembles the whole case detail in one round-trip; returns NULL when the case does not exist
+CREATE OR REPLACE FUNCTION get_case_full(p_id TEXT)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT jsonb_build_object(
+        'case', jsonb_build_object(
+            'id', c.id,
+            'case_info', c.case_info,
+            'created_at', c.created_at,
+            'updated_at', c.updated_at
+        ),
+        'evidence', COALESCE((
+            SELECT jsonb_agg(jsonb_build_object(
+                'id', e.id,
+                'case_id', e.case_id,
+                'evidence_info', e.evidence_info,
+                'created_at', e.created_at,
+                'updated_at', e.updated_at,
+                'media', m.media
+            ) ORDER BY e.created_at DESC)
+            FROM evidence e
+            LEFT JOIN LATERAL (
+                SELECT jsonb_build_object(
+                    'url', mm.media_info->>'url',
+                    'transcript', mm.media_info->>'transcript',
+                    'duration', mm.media_info->'duration'
+                ) AS media
+                FROM media mm
+                WHERE mm.case_id = c.id
+                  AND mm.media_info->>'type' = e.evidence_info->>'type'
+                ORDER BY mm.created_at DESC
+                LIMIT 1
+            ) m ON TRUE
+            WHERE e.case_id = c.id
+        ), '[]'::jsonb),
+        'comparisons', COALESCE((
+            SELECT jsonb_agg(to_jsonb(a) ORDER BY a.created_at DESC)
+            FROM case_audio_comparison a
+            WHERE a.case_id = c.id
+        ), '[]'::jsonb)
+    )
+    FROM cases c
+    WHERE c.id = p_id;
+$$;
+
+-- Add comment to document the function
+COMMENT ON FUNCTION get_case_full(TEXT) IS 'Case detail with evidence, matching media and audio comparisons as nested JSON';
@@ -0,0 +1,15 @@
+-- Merge a partial JSON patch into case_info and return the updated case
+-- Returns no rows when the case does not exist
+CREATE OR REPLACE FUNCTION update_case_info(p_id TEXT, p_patch JSONB)
+RETURNS SETOF cases
+LANGUAGE sql
+AS $$
+    UPDATE cases
+    SET case_info = case_info || p_patch,
+        updated_at = NOW()
+    WHERE id = p_id
+    RETURNING *;
+$$;
+
+-- Add comment to document the function
+COMMENT ON FUNCTION update_case_info(TEXT, JSONB) IS 'Partial case_info update in a single UPDATE ... RETURNING round-trip';
@@ -0,0 +1,5 @@
+-- Create composite indexes so per-case lists come back already ordered newest first
+-- CONCURRENTLY avoids locking writes; run these statements outside a transaction block
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_evidence_case_id_created_at ON evidence(case_id, created_at DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_media_case_id_created_at ON media(case_id, created_at DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_case_audio_comparison_case_id_created_at ON case_audio_comparison(case_id, created_at DESC);
@@ -0,0 +1,2 @@
+-- Create index for keyset pagination of the case list (newest first)
+CREATE INDEX IF NOT EXISTS idx_cases_created_at_id ON cases(created_at DESC, id);
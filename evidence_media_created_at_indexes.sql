@@ -0,0 +1,4 @@
+-- Create indexes so the paged evidence and media lists (newest first) avoid a sort over the whole table
+-- CONCURRENTLY avoids locking writes; run these statements outside a transaction block
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_evidence_created_at ON evidence(created_at DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_media_created_at ON media(created_at DESC);
@@ -0,0 +1,27 @@
+-- Merge a partial JSON patch into evidence_info / media_info and return the updated row
+-- Return no rows when the record does not exist
+CREATE OR REPLACE FUNCTION update_evidence_info(p_id TEXT, p_patch JSONB)
+RETURNS SETOF evidence
+LANGUAGE sql
+AS $$
+    UPDATE evidence
+    SET evidence_info = evidence_info || p_patch,
+        updated_at = NOW()
+    WHERE id = p_id
+    RETURNING *;
+$$;
+
+CREATE OR REPLACE FUNCTION update_media_info(p_id TEXT, p_patch JSONB)
+RETURNS SETOF media
+LANGUAGE sql
+AS $$
+    UPDATE media
+    SET media_info = media_info || p_patch,
+        updated_at = NOW()
+    WHERE id = p_id
+    RETURNING *;
+$$;
+
+-- Add comments to document the functions
+COMMENT ON FUNCTION update_evidence_info(TEXT, JSONB) IS 'Partial evidence_info update in a single UPDATE ... RETURNING round-trip';
+COMMENT ON FUNCTION update_media_info(TEXT, JSONB) IS 'Partial media_info update in a single UPDATE ... RETURNING round-trip';
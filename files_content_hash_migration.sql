@@ -0,0 +1,11 @@
+-- Add content hash so identical re-uploads can reuse the existing S3 object
+ALTER TABLE files ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+-- Create index for the per-user duplicate lookup on upload
+CREATE INDEX IF NOT EXISTS idx_files_user_id_content_hash ON files(user_id, content_hash);
+
+-- Create index for the shared-object check on delete
+CREATE INDEX IF NOT EXISTS idx_files_object_name ON files(object_name);
+
+-- Add comment to document the column
+COMMENT ON COLUMN files.content_hash IS 'BLAKE2b-256 hex digest of the file content; rows with equal hashes share one S3 object';
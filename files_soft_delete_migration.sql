@@ -0,0 +1,8 @@
+-- Add a tombstone column so file deletion can be resumed after a partial failure
+ALTER TABLE files ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMP WITH TIME ZONE;
+
+-- Create partial index so a sweeper can find rows whose S3 cleanup did not finish
+CREATE INDEX IF NOT EXISTS idx_files_deleted_at ON files(deleted_at) WHERE deleted_at IS NOT NULL;
+
+-- Add comment to document the column
+COMMENT ON COLUMN files.deleted_at IS 'Set when deletion starts; the row is removed once the S3 object is gone';
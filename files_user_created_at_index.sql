@@ -0,0 +1,2 @@
+-- Create index for a user's paged file listing (newest first) and its exact count
+CREATE INDEX IF NOT EXISTS idx_files_user_id_created_at ON files(user_id, created_at DESC);
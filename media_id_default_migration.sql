@@ -0,0 +1,6 @@
+-- Let the database generate media IDs when the client does not supply one
+-- gen_random_uuid() is built into PostgreSQL 13+; the column stays TEXT so existing IDs remain valid
+ALTER TABLE media ALTER COLUMN id SET DEFAULT gen_random_uuid()::text;
+
+-- Add comment to document the default
+COMMENT ON COLUMN media.id IS 'Media ID; defaults to a random UUID when omitted on insert';
@@ -0,0 +1,19 @@
+-- Merge a JSON patch into media_info for the media record matching a case and URL
+-- Returns the updated rows so callers can detect a missing record without a prior SELECT
+CREATE OR REPLACE FUNCTION merge_media_info(p_case_id TEXT, p_url TEXT, p_patch JSONB)
+RETURNS SETOF media
+LANGUAGE sql
+AS $$
+    UPDATE media
+    SET media_info = media_info || p_patch,
+        updated_at = NOW()
+    WHERE case_id = p_case_id
+      AND media_info->>'url' = p_url
+    RETURNING *;
+$$;
+
+-- Create index for case/URL lookups on media
+CREATE INDEX IF NOT EXISTS idx_media_case_id_url ON media(case_id, (media_info->>'url'));
+
+-- Add comment to document the function
+COMMENT ON FUNCTION merge_media_info(TEXT, TEXT, JSONB) IS 'Merge analysis results into media_info in a single UPDATE ... RETURNING round-trip';
@@ -0,0 +1,29 @@
+-- Return the most recent media record of each type for the given cases
+-- Only the media_info keys used to enrich evidence are projected
+CREATE OR REPLACE FUNCTION media_latest_per_type(p_case_ids TEXT[])
+RETURNS TABLE (
+    case_id TEXT,
+    type TEXT,
+    url TEXT,
+    transcript TEXT,
+    duration JSONB
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT DISTINCT ON (m.case_id, m.media_info->>'type')
+        m.case_id,
+        m.media_info->>'type' AS type,
+        m.media_info->>'url' AS url,
+        m.media_info->>'transcript' AS transcript,
+        m.media_info->'duration' AS duration
+    FROM media m
+    WHERE m.case_id = ANY(p_case_ids)
+    ORDER BY m.case_id, m.media_info->>'type', m.created_at DESC;
+$$;
+
+-- Create index to serve the DISTINCT ON ordering
+CREATE INDEX IF NOT EXISTS idx_media_case_id_type_created_at ON media(case_id, (media_info->>'type'), created_at DESC);
+
+-- Add comment to document the function
+COMMENT ON FUNCTION media_latest_per_type(TEXT[]) IS 'Latest media record per type for each case, used to enrich evidence listings';
@@ -0,0 +1,70 @@
+from typing import Optional
+
+import httpx
+import orjson
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.responses import ORJSONResponse
+from postgrest import AsyncPostgrestClient
+
+from app.core.cache import response_cache
+from app.core.database import supabase_client
+
+POSTGREST_URL = "http://postgrest.test"
+
+
+def json_response(data, status_code: int = 200, headers: Optional[dict] = None) -> httpx.Response:
+    """Build a PostgREST-style JSON response."""
+    return httpx.Response(status_code, content=orjson.dumps(data), headers={"Content-Type": "application/json", **(headers or {})})
+
+
+class FakePostgrest:
+    """
+    Stand-in for the Supabase REST API.
+
+    Requests made by the real postgrest-py builders are passed to `handler`
+    (set by each test) and recorded in `requests`.
+    """
+
+    def __init__(self):
+        self.requests: list[httpx.Request] = []
+        self.handler = None
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        return self.handler(request)
+
+    def client(self) -> AsyncPostgrestClient:
+        client = AsyncPostgrestClient(POSTGREST_URL)
+        client.session = httpx.AsyncClient(
+            base_url=POSTGREST_URL,
+            headers=client.session.headers,
+            transport=httpx.MockTransport(self)
+        )
+        return client
+
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    """Start every test with an empty in-process response cache."""
+    for cache in (response_cache.local, response_cache.local_stale):
+        cache.clear()
+    yield
+    for cache in (response_cache.local, response_cache.local_stale):
+        cache.clear()
+
+
+@pytest.fixture
+def postgrest(monkeypatch) -> FakePostgrest:
+    """Route both async Supabase clients to a FakePostgrest."""
+    fake = FakePostgrest()
+    monkeypatch.setattr(supabase_client, "async_client", fake.client())
+    monkeypatch.setattr(supabase_client, "async_service_client", fake.client())
+    return fake
+
+
+def make_app(router: APIRouter, prefix: str) -> FastAPI:
+    """Mount a single router the way app.main does, without the app lifespan."""
+    app = FastAPI(default_response_class=ORJSONResponse)
+    app.include_router(router, prefix=prefix)
+    return app
@@ -0,0 +1,108 @@
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import evidence, media
+from app.core.cache import response_cache
+from tests.conftest import json_response, make_app
+
+app = make_app(evidence.router, "/api/v1/evidence")
+app.include_router(media.router, prefix="/api/v1/media")
+client = TestClient(app)
+
+EVIDENCE_INFO = {
+    "type": "document", "name": "Report", "description": "Scan",
+    "uploadDate": "2024-01-02", "fileSize": "1MB", "tags": ["scan"]
+}
+MEDIA_INFO = {"type": "audio", "url": "https://example.com/a.mp3", "title": "Interview", "description": "Witness"}
+
+SINGLE_ENDPOINTS = [
+    ("/api/v1/evidence/", "evidence", lambda i, case_id: {"id": f"ev-{i}", "case_id": case_id, "evidence_info": EVIDENCE_INFO}),
+    ("/api/v1/media/", "media", lambda i, case_id: {"id": f"media-{i}", "case_id": case_id, "media_info": MEDIA_INFO}),
+]
+ENDPOINTS = [
+    ("/api/v1/evidence/bulk", "evidence", lambda i, case_id: {"id": f"ev-{i}", "case_id": case_id, "evidence_info": EVIDENCE_INFO}, evidence),
+    ("/api/v1/media/bulk", "media", lambda i, case_id: {"id": f"media-{i}", "case_id": case_id, "media_info": MEDIA_INFO}, media),
+]
+
+
+def _insert_handler(table: str, existing_ids: set):
+    """Serve a single or multi-row INSERT into `table`, rejecting IDs in `existing_ids` like the primary key would."""
+    def handler(request):
+        assert request.method == "POST" and request.url.path == f"/{table}"
+        body = orjson.loads(request.content)
+        rows = body if isinstance(body, list) else [body]
+        if any(row.get("id") in existing_ids for row in rows):
+            return json_response(
+                {"code": "23505", "message": f"duplicate key value violates unique constraint \"{table}_pkey\"", "details": None, "hint": None},
+                status_code=409
+            )
+        return json_response([{**row, "created_at": "2024-01-02T10:00:00+00:00", "updated_at": None} for row in rows], status_code=201)
+    return handler
+
+
+@pytest.mark.parametrize("path,table,make_row,module", ENDPOINTS)
+def test_bulk_create_rejects_more_than_max_rows(postgrest, path, table, make_row, module):
+    postgrest.handler = _insert_handler(table, set())
+
+    too_many = [make_row(i, "case-1") for i in range(module.MAX_BULK_CREATE + 1)]
+    response = client.post(path, json=too_many)
+
+    assert response.status_code == 400
+    assert postgrest.requests == []
+
+
+@pytest.mark.parametrize("path,table,make_row,module", ENDPOINTS)
+def test_bulk_create_accepts_max_rows_in_one_insert(postgrest, path, table, make_row, module):
+    postgrest.handler = _insert_handler(table, set())
+
+    rows = [make_row(i, "case-1") for i in range(module.MAX_BULK_CREATE)]
+    response = client.post(path, json=rows)
+
+    assert response.status_code == 200
+    assert len(response.json()) == module.MAX_BULK_CREATE
+    assert len(postgrest.requests) == 1
+
+
+@pytest.mark.parametrize("path,table,make_row,module", ENDPOINTS)
+def test_bulk_create_duplicate_id_is_a_conflict(postgrest, path, table, make_row, module):
+    postgrest.handler = _insert_handler(table, {make_row(1, "case-1")["id"]})
+
+    response = client.post(path, json=[make_row(0, "case-1"), make_row(1, "case-1")])
+
+    assert response.status_code == 409
+    assert "already exists" in response.json()["detail"]
+
+
+@pytest.mark.parametrize("path,table,make_row", SINGLE_ENDPOINTS)
+def test_single_create_duplicate_id_is_a_conflict(postgrest, path, table, make_row):
+    """A duplicate single create reports 409, the same as a duplicate inside a bulk create."""
+    postgrest.handler = _insert_handler(table, {make_row(0, "case-1")["id"]})
+
+    response = client.post(path, json=make_row(0, "case-1"))
+
+    assert response.status_code == 409
+    assert "already exists" in response.json()["detail"]
+
+
+@pytest.mark.parametrize("path,table,make_row", SINGLE_ENDPOINTS)
+def test_single_create_new_id_succeeds(postgrest, path, table, make_row):
+    postgrest.handler = _insert_handler(table, {make_row(0, "case-1")["id"]})
+
+    response = client.post(path, json=make_row(1, "case-1"))
+
+    assert response.status_code == 200
+    assert response.json()["id"] == make_row(1, "case-1")["id"]
+
+
+@pytest.mark.parametrize("path,table,make_row,module", ENDPOINTS)
+def test_bulk_create_invalidates_cached_lists_and_cases(postgrest, path, table, make_row, module):
+    postgrest.handler = _insert_handler(table, set())
+    cached = [f"{table}:all:1:50", f"{table}:case:case-1:1:50", "cases:case-1", "cases:case-2", "cases:page:None:100"]
+    for key in cached:
+        response_cache.local[key] = b"[]"
+
+    response = client.post(path, json=[make_row(0, "case-1"), make_row(1, "case-3")])
+
+    assert response.status_code == 200
+    assert set(response_cache.local.keys()) == {"cases:case-2"}
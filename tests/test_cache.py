@@ -0,0 +1,216 @@
+import asyncio
+from copy import deepcopy
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import cases, evidence
+from app.core.cache import CACHE_HIT, CACHE_MISS, ResponseCache, cached_json_response, etag_for, etag_matches, response_cache
+from tests.conftest import json_response, make_app
+
+app = make_app(cases.router, "/api/v1/cases")
+app.include_router(evidence.router, prefix="/api/v1/evidence")
+app_client = TestClient(app)
+
+
+def test_concurrent_misses_load_once_and_release_the_lock():
+    """Concurrent misses share one load, and the per-key lock is dropped afterwards."""
+    cache = ResponseCache()
+    calls = 0
+
+    async def loader() -> bytes:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return b"value"
+
+    async def run():
+        return await asyncio.gather(*(cache.lookup("key", loader) for _ in range(5)))
+
+    results = asyncio.run(run())
+
+    assert calls == 1
+    assert sorted(state for _, state in results) == [CACHE_HIT] * 4 + [CACHE_MISS]
+    assert cache.locks == {}
+    assert cache.lock_users == {}
+
+
+def test_locks_do_not_accumulate_per_key():
+    """Every distinct key gets a lock only while it is being filled."""
+    cache = ResponseCache()
+
+    async def run():
+        for page in range(100):
+            await cache.lookup(f"page:{page}", lambda: asyncio.sleep(0, b"value"))
+
+    asyncio.run(run())
+
+    assert cache.locks == {}
+
+
+def test_lock_is_released_when_the_loader_fails():
+    cache = ResponseCache()
+
+    async def loader() -> bytes:
+        raise RuntimeError("boom")
+
+    async def run():
+        try:
+            await cache.lookup("key", loader)
+        except RuntimeError:
+            pass
+
+    asyncio.run(run())
+
+    assert cache.locks == {}
+    assert cache.lock_users == {}
+
+
+def test_etag_matches_single_list_weak_and_wildcard():
+    etag = etag_for(b'{"id":"case-1"}')
+    opaque = etag[2:]
+
+    assert etag.startswith('W/"')
+    assert etag_matches(etag, etag)
+    assert etag_matches(etag, opaque)
+    assert etag_matches(etag, f'W/"other", {etag}')
+    assert etag_matches(etag, f'"other",{opaque}')
+    assert etag_matches(etag, "*")
+    assert not etag_matches(etag, 'W/"other"')
+    assert not etag_matches(etag, None)
+    assert not etag_matches(etag, "")
+
+
+def test_cached_json_response_returns_304_on_match():
+    content = b'{"id":"case-1"}'
+
+    fresh = cached_json_response(content, CACHE_MISS)
+    assert fresh.status_code == 200
+    assert fresh.body == content
+    assert fresh.headers["X-Cache"] == CACHE_MISS
+
+    not_modified = cached_json_response(content, CACHE_HIT, if_none_match=fresh.headers["ETag"])
+    assert not_modified.status_code == 304
+    assert not_modified.body == b""
+    assert not_modified.headers["ETag"] == fresh.headers["ETag"]
+
+
+CASE_ROW = {
+    "id": "case-1",
+    "case_info": {
+        "firNumber": "FIR-1", "title": "Case", "summary": "Summary", "petitioner": "P",
+        "accused": "A", "investigatingOfficer": "O", "registeredDate": "2024-01-01",
+        "status": "open", "visibility": "private", "location": "City"
+    },
+    "created_at": "2024-01-01T10:00:00+00:00",
+    "updated_at": None
+}
+EVIDENCE_ROW = {
+    "id": "ev-1",
+    "case_id": "case-1",
+    "evidence_info": {
+        "type": "document", "name": "Report", "description": "Scan",
+        "uploadDate": "2024-01-02", "fileSize": "1MB", "tags": ["scan"]
+    },
+    "created_at": "2024-01-02T10:00:00+00:00",
+    "updated_at": None
+}
+
+
+@pytest.fixture
+def case_store(postgrest):
+    """Serve get_case_full, update_case_info and update_evidence_info from in-memory rows."""
+    store = {"case": deepcopy(CASE_ROW), "evidence": deepcopy(EVIDENCE_ROW)}
+
+    def handler(request):
+        if request.url.path == "/rpc/get_case_full":
+            return json_response({"case": store["case"], "evidence": [store["evidence"]], "comparisons": []})
+        if request.url.path == "/rpc/update_case_info":
+            store["case"]["case_info"].update(orjson.loads(request.content)["p_patch"])
+            return json_response([store["case"]])
+        if request.url.path == "/rpc/update_evidence_info":
+            store["evidence"]["evidence_info"].update(orjson.loads(request.content)["p_patch"])
+            return json_response([store["evidence"]])
+        raise AssertionError(f"Unexpected request {request.method} {request.url}")
+
+    postgrest.handler = handler
+    return store
+
+
+def test_case_if_none_match_returns_304(case_store):
+    first = app_client.get("/api/v1/cases/case-1")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    for if_none_match in (etag, etag[2:], f'W/"stale", {etag}'):
+        response = app_client.get("/api/v1/cases/case-1", headers={"If-None-Match": if_none_match})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+
+
+def test_case_etag_changes_after_case_update(case_store):
+    etag = app_client.get("/api/v1/cases/case-1").headers["ETag"]
+
+    updated = app_client.put("/api/v1/cases/case-1", json={"case_info": {"title": "Renamed"}})
+    assert updated.status_code == 200
+
+    response = app_client.get("/api/v1/cases/case-1", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["title"] == "Renamed"
+    assert response.headers["ETag"] != etag
+
+
+def test_case_etag_changes_after_evidence_update(case_store):
+    """Cached cases embed their evidence, so an evidence write must invalidate the case too."""
+    etag = app_client.get("/api/v1/cases/case-1").headers["ETag"]
+
+    updated = app_client.put("/api/v1/evidence/ev-1", json={"evidence_info": {"name": "Final report"}})
+    assert updated.status_code == 200
+
+    response = app_client.get("/api/v1/cases/case-1", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["evidence"][0]["name"] == "Final report"
+    assert response.headers["ETag"] != etag
+
+
+def test_existence_checks_never_fall_back_to_stale_copies():
+    """With allow_stale=False a failed reload propagates instead of serving the last value."""
+    cache = ResponseCache()
+
+    async def exists() -> bytes:
+        return b"1"
+
+    async def outage() -> bytes:
+        raise RuntimeError("S3 unavailable")
+
+    async def run():
+        await cache.get_or_load("files:exists:obj", exists, allow_stale=False)
+        # Fresh entry expires
+        cache.local.clear()
+        await cache.get_or_load("files:exists:obj", outage, allow_stale=False)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(run())
+    assert "files:exists:obj" not in cache.local_stale
+
+
+def test_case_delete_drops_cached_evidence_and_media(postgrest):
+    """Deleting a case cascades to its evidence and media, so their cached lists must go too."""
+    def handler(request):
+        assert request.method == "DELETE" and request.url.path == "/cases"
+        return json_response([{"id": "case-1"}])
+
+    postgrest.handler = handler
+    cached = [
+        "cases:case-1", "cases:case-2", "cases:page:None:100",
+        "evidence:all:1:50", "evidence:case:case-1:1:50", "media:all:1:50", "media:id:media-1"
+    ]
+    for key in cached:
+        response_cache.local[key] = b"[]"
+
+    response = app_client.delete("/api/v1/cases/case-1")
+
+    assert response.status_code == 200
+    assert set(response_cache.local.keys()) == {"cases:case-2"}
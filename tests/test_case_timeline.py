@@ -0,0 +1,40 @@
+from fastapi.testclient import TestClient
+
+from app.api import case_timeline
+from tests.conftest import json_response, make_app
+
+client = TestClient(make_app(case_timeline.router, "/api/v1/case-timeline"))
+
+
+def _timeline_row(entry_id: int, day: int) -> dict:
+    return {"timeline_info": {
+        "id": entry_id, "time": 10.5, "duration": 5.0, "actor": "Officer",
+        "date": {"month": 1, "day": day}, "title": f"Entry {entry_id}", "type": "event",
+        "confidence": 90, "evidence": "ev-1", "description": "Description"
+    }}
+
+
+ROWS = [_timeline_row(1, 1), _timeline_row(2, 2)]
+
+
+def _timeline_handler(request):
+    assert request.url.path == "/case_timeline"
+    assert request.url.params["order"].endswith(",id")
+    return json_response(ROWS)
+
+
+def test_case_timeline_streams_projected_rows(postgrest):
+    postgrest.handler = _timeline_handler
+
+    response = client.get("/api/v1/case-timeline/case/case-1")
+
+    assert response.status_code == 200
+    assert [entry["id"] for entry in response.json()] == [1, 2]
+    assert response.json()[0]["title"] == "Entry 1"
+    assert postgrest.requests[0].url.params["case_id"] == "eq.case-1"
+
+
+def test_timeline_errors_before_streaming_return_500(postgrest):
+    postgrest.handler = lambda request: json_response({"message": "boom", "code": "XX000"}, status_code=500)
+
+    assert client.get("/api/v1/case-timeline/").status_code == 500
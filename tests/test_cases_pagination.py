@@ -0,0 +1,95 @@
+import re
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import cases
+from tests.conftest import json_response, make_app
+
+client = TestClient(make_app(cases.router, "/api/v1/cases"))
+
+CASE_INFO = {
+    "firNumber": "FIR-1", "title": "Case", "summary": "Summary", "petitioner": "P",
+    "accused": "A", "investigatingOfficer": "O", "registeredDate": "2024-01-01",
+    "status": "open", "visibility": "private", "location": "City"
+}
+
+# Five cases, three of which share a created_at (as rows inserted with NOW() in one statement do)
+CASE_ROWS = [
+    {"id": "case-1", "created_at": "2024-03-01T10:00:00+00:00"},
+    {"id": "case-2", "created_at": "2024-02-01T10:00:00+00:00"},
+    {"id": "case-3", "created_at": "2024-02-01T10:00:00+00:00"},
+    {"id": "case-4", "created_at": "2024-02-01T10:00:00+00:00"},
+    {"id": "case-5", "created_at": "2024-01-01T10:00:00+00:00"},
+]
+
+KEYSET_FILTER = re.compile(r'^\(created_at\.lt\."(.+)",and\(created_at\.eq\."(.+)",id\.gt\."(.+)"\)\)$')
+
+
+def _cases_handler(request):
+    """Serve GET /cases the way PostgREST would for the query built by _load_case_page."""
+    if request.url.path == "/rpc/media_latest_per_type":
+        return json_response([])
+    assert request.url.path == "/cases"
+    assert request.url.params["order"] == "created_at.desc,id"
+    assert set(request.url.params) <= {"select", "order", "limit", "or", "evidence.order", "case_audio_comparison.order"}
+
+    rows = sorted(CASE_ROWS, key=lambda row: row["id"])
+    rows.sort(key=lambda row: datetime.fromisoformat(row["created_at"]), reverse=True)
+    if "or" in request.url.params:
+        lt, eq, after_id = KEYSET_FILTER.match(request.url.params["or"]).groups()
+        assert lt == eq
+        boundary = datetime.fromisoformat(lt)
+        rows = [
+            row for row in rows
+            if datetime.fromisoformat(row["created_at"]) < boundary
+            or (datetime.fromisoformat(row["created_at"]) == boundary and row["id"] > after_id)
+        ]
+    rows = rows[:int(request.url.params["limit"])]
+
+    return json_response([
+        {**row, "case_info": CASE_INFO, "updated_at": None, "evidence": [], "case_audio_comparison": []}
+        for row in rows
+    ])
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3])
+def test_case_pages_do_not_skip_rows_sharing_created_at(postgrest, limit):
+    """Walking X-Next-Cursor visits every case once, even across a created_at tie at a page boundary."""
+    postgrest.handler = _cases_handler
+
+    seen = []
+    params = {"limit": limit}
+    for _ in range(len(CASE_ROWS) + 1):
+        response = client.get("/api/v1/cases/", params=params)
+        assert response.status_code == 200
+        seen += [case["id"] for case in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params = {"limit": limit, "cursor": cursor}
+    else:
+        pytest.fail("X-Next-Cursor never ran out")
+
+    assert seen == ["case-1", "case-2", "case-3", "case-4", "case-5"]
+
+
+def test_case_stream_does_not_skip_rows_sharing_created_at(postgrest, monkeypatch):
+    """The unbounded stream walks the same cursor across page boundaries."""
+    postgrest.handler = _cases_handler
+    monkeypatch.setattr(cases, "CASE_PAGE_SIZE", 2)
+
+    response = client.get("/api/v1/cases/")
+
+    assert response.status_code == 200
+    assert [case["id"] for case in response.json()] == ["case-1", "case-2", "case-3", "case-4", "case-5"]
+
+
+def test_invalid_cursor_is_rejected(postgrest):
+    postgrest.handler = _cases_handler
+
+    response = client.get("/api/v1/cases/", params={"limit": 2, "cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
+    assert postgrest.requests == []
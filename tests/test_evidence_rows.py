@@ -0,0 +1,65 @@
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from app.api import evidence
+from tests.conftest import json_response, make_app
+
+client = TestClient(make_app(evidence.router, "/api/v1/evidence"))
+
+EVIDENCE_ROW = {
+    "id": "ev-1",
+    "case_id": "case-1",
+    "evidence_info": {
+        "type": "document", "name": "Report", "description": "Scan",
+        "uploadDate": "2024-01-02", "fileSize": "1MB", "tags": ["scan"]
+    },
+    "created_at": "2024-01-02T10:00:00+00:00",
+    "updated_at": None
+}
+
+
+def _without(*keys: str) -> dict:
+    """EVIDENCE_ROW with the given evidence_info keys removed, as a pre-schema row would be."""
+    evidence_info = {key: value for key, value in EVIDENCE_ROW["evidence_info"].items() if key not in keys}
+    return {**EVIDENCE_ROW, "evidence_info": evidence_info}
+
+
+def test_complete_rows_are_built_without_losing_fields():
+    response = evidence._to_evidence_response(EVIDENCE_ROW)
+
+    assert response.model_dump(mode="json", include={"name", "tags", "caseId", "created_at"}) == {
+        "name": "Report", "tags": ["scan"], "caseId": "case-1", "created_at": "2024-01-02T10:00:00Z"
+    }
+
+
+@pytest.mark.parametrize("missing", ["tags", "name"])
+def test_rows_missing_required_fields_fail_validation(missing):
+    with pytest.raises(ValidationError):
+        evidence._to_evidence_response(_without(missing))
+
+
+def test_single_evidence_with_missing_field_is_an_error(postgrest):
+    postgrest.handler = lambda request: json_response(EVIDENCE_ROW)
+    assert client.get("/api/v1/evidence/ev-1").status_code == 200
+
+    postgrest.handler = lambda request: json_response(_without("tags"))
+
+    response = client.get("/api/v1/evidence/ev-1")
+
+    assert response.status_code == 500
+
+
+def test_evidence_page_with_missing_field_is_an_error(postgrest):
+    postgrest.handler = lambda request: json_response([EVIDENCE_ROW], headers={"Content-Range": "0-0/1"})
+    assert client.get("/api/v1/evidence/").json()["total"] == 1
+
+    postgrest.handler = lambda request: json_response(
+        [EVIDENCE_ROW, _without("name")],
+        headers={"Content-Range": "0-1/2"}
+    )
+
+    # Different page size, so the page cached above (or its stale copy) is not served
+    response = client.get("/api/v1/evidence/", params={"per_page": 10})
+
+    assert response.status_code == 500
@@ -0,0 +1,119 @@
+import hashlib
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import files
+from app.api.auth import get_current_user
+from tests.conftest import json_response, make_app
+
+USER = {"id": "user-1", "email": "user@example.com"}
+CONTENT = b"scanned report"
+CONTENT_HASH = hashlib.blake2b(CONTENT, digest_size=32).hexdigest()
+SOURCE_OBJECT = "user-1/source.pdf"
+
+app = make_app(files.router, "/api/v1/files")
+app.dependency_overrides[get_current_user] = lambda: USER
+client = TestClient(app)
+
+
+class UploadTable:
+    """In-memory files table served through the PostgREST calls made by upload_file."""
+
+    def __init__(self):
+        self.rows = {}
+        # Called with the inserted row, e.g. to interleave a concurrent delete
+        self.on_insert = None
+
+    def add_source(self):
+        self.rows["source"] = {
+            "id": "source", "object_name": SOURCE_OBJECT, "size": len(CONTENT), "user_id": USER["id"],
+            "content_hash": CONTENT_HASH, "deleted_at": None
+        }
+
+    def __call__(self, request):
+        params = request.url.params
+        if request.method == "GET" and "content_hash" in params:
+            live = [
+                {"id": row["id"], "object_name": row["object_name"], "size": row["size"]} for row in self.rows.values()
+                if row["content_hash"] == params["content_hash"][3:] and row["deleted_at"] is None
+            ]
+            return json_response(live[:1])
+        if request.method == "GET":
+            row = self.rows.get(params["id"][3:])
+            return json_response([{"id": row["id"]}] if row and row["deleted_at"] is None else [])
+        if request.method == "POST":
+            row = {**orjson.loads(request.content), "deleted_at": None}
+            self.rows[row["id"]] = row
+            if self.on_insert:
+                self.on_insert(row)
+            return json_response([row], status_code=201)
+        if request.method == "PATCH":
+            row = self.rows[params["id"][3:]]
+            row.update(orjson.loads(request.content))
+            return json_response([row])
+        raise AssertionError(f"Unexpected request {request.method} {request.url}")
+
+
+@pytest.fixture
+def files_table(postgrest):
+    table = UploadTable()
+    postgrest.handler = table
+    return table
+
+
+@pytest.fixture
+def s3_uploads(monkeypatch):
+    """Record S3 uploads as (object_name, content) pairs."""
+    uploads = []
+
+    async def upload_file(file_obj, object_name, content_type=None):
+        content = file_obj.read()
+        uploads.append((object_name, content))
+        return {"success": True, "url": f"https://s3.test/{object_name}", "bucket": "bucket", "size": len(content)}
+
+    monkeypatch.setattr(files.s3_service, "upload_file", upload_file)
+    monkeypatch.setattr(files.s3_service, "generate_presigned_url", lambda object_name: f"https://s3.test/{object_name}")
+    return uploads
+
+
+def _upload():
+    return client.post("/api/v1/files/upload", files={"file": ("report.pdf", CONTENT, "application/pdf")})
+
+
+def test_new_content_is_uploaded(files_table, s3_uploads):
+    response = _upload()
+
+    assert response.status_code == 200
+    assert s3_uploads == [(response.json()["object_name"], CONTENT)]
+    assert response.json()["object_name"] == f"user-1/{response.json()['id']}.pdf"
+
+
+def test_duplicate_content_reuses_the_live_object(files_table, s3_uploads):
+    files_table.add_source()
+
+    response = _upload()
+
+    assert response.status_code == 200
+    assert response.json()["object_name"] == SOURCE_OBJECT
+    assert s3_uploads == []
+
+
+def test_duplicate_of_a_concurrently_deleted_file_stores_its_own_copy(files_table, s3_uploads):
+    """A delete that tombstones the source before our insert may remove the shared object."""
+    files_table.add_source()
+
+    def concurrent_delete(row):
+        files_table.rows["source"]["deleted_at"] = "2024-01-01T00:00:00"
+
+    files_table.on_insert = concurrent_delete
+
+    response = _upload()
+
+    assert response.status_code == 200
+    file_id = response.json()["id"]
+    own_object = f"user-1/{file_id}.pdf"
+    assert response.json()["object_name"] == own_object
+    assert s3_uploads == [(own_object, CONTENT)]
+    assert files_table.rows[file_id]["object_name"] == own_object
@@ -0,0 +1,189 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import files
+from app.api.auth import get_current_user
+from app.utils import retry
+from app.utils.retry import retry_async
+from tests.conftest import json_response, make_app
+
+USER = {"id": "user-1", "email": "user@example.com"}
+OBJECT_NAME = "user-1/file-1.pdf"
+
+app = make_app(files.router, "/api/v1/files")
+app.dependency_overrides[get_current_user] = lambda: USER
+client = TestClient(app)
+
+
+@pytest.fixture
+def waits(monkeypatch):
+    """Record the (low, high) bounds of every backoff wait and skip the actual sleep."""
+    bounds = []
+
+    def uniform(low, high):
+        bounds.append((low, high))
+        return 0
+
+    monkeypatch.setattr(retry.random, "uniform", uniform)
+    return bounds
+
+
+def _flaky(failures: int, error: BaseException = httpx.ConnectError("reset")):
+    """Operation that raises `error` for its first `failures` calls, then returns the call count."""
+    calls = 0
+
+    async def operation():
+        nonlocal calls
+        calls += 1
+        if calls <= failures:
+            raise error
+        return calls
+
+    return operation
+
+
+def test_retry_succeeds_after_transient_errors(waits):
+    assert asyncio.run(retry_async(_flaky(2), retries=3)) == 3
+    assert len(waits) == 2
+
+
+def test_retry_gives_up_after_retries(waits):
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(retry_async(_flaky(10), retries=3))
+    assert len(waits) == 3
+
+
+def test_retry_does_not_retry_other_errors(waits):
+    with pytest.raises(ValueError):
+        asyncio.run(retry_async(_flaky(1, ValueError("bad request")), retries=3))
+    assert waits == []
+
+
+def test_backoff_is_full_jitter_capped_at_max_delay(waits):
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(retry_async(_flaky(10), retries=5, base_delay=0.2, max_delay=1.0))
+    assert waits == [(0, 0.2), (0, 0.4), (0, 0.8), (0, 1.0), (0, 1.0)]
+
+
+def test_jittered_waits_stay_within_bounds(monkeypatch):
+    delays = []
+    real_uniform = retry.random.uniform
+
+    def uniform(low, high):
+        delays.append((real_uniform(low, high), high))
+        return 0
+
+    monkeypatch.setattr(retry.random, "uniform", uniform)
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(retry_async(_flaky(100), retries=50, base_delay=0.2, max_delay=2.0))
+
+    assert len(delays) == 50
+    assert all(0 <= delay <= cap <= 2.0 for delay, cap in delays)
+
+
+class FilesTable:
+    """In-memory files table served through the PostgREST calls made by delete_file."""
+
+    def __init__(self):
+        self.rows = {"file-1": {"id": "file-1", "object_name": OBJECT_NAME, "user_id": USER["id"], "deleted_at": None}}
+        self.hard_deletes = 0
+        self.fail_next = {}
+
+    def __call__(self, request):
+        step = request.method
+        if self.fail_next.get(step):
+            self.fail_next[step] -= 1
+            raise httpx.ConnectError("connection reset")
+
+        params = request.url.params
+        if step == "PATCH":
+            row = self.rows.get(params["id"][3:])
+            if row is None or row["user_id"] != params["user_id"][3:]:
+                return json_response([])
+            row["deleted_at"] = "2024-01-01T00:00:00"
+            return json_response([{"object_name": row["object_name"]}])
+        if step == "GET":
+            shared = [
+                {"id": row["id"]} for row in self.rows.values()
+                if row["object_name"] == params["object_name"][3:] and row["id"] != params["id"][4:] and row["deleted_at"] is None
+            ]
+            return json_response(shared)
+        if step == "DELETE":
+            row = self.rows.pop(params["id"][3:], None)
+            if row is None:
+                return json_response([])
+            self.hard_deletes += 1
+            return json_response([{"id": row["id"]}])
+        raise AssertionError(f"Unexpected request {request.method} {request.url}")
+
+
+@pytest.fixture
+def files_table(postgrest, waits):
+    table = FilesTable()
+    postgrest.handler = table
+    return table
+
+
+@pytest.fixture
+def s3_deletes(monkeypatch):
+    """Record S3 deletes; set `fail` to make the next attempts report failure."""
+    state = {"calls": [], "deleted": [], "fail": 0}
+
+    async def delete_file(object_name):
+        state["calls"].append(object_name)
+        if state["fail"]:
+            state["fail"] -= 1
+            return False
+        state["deleted"].append(object_name)
+        return True
+
+    monkeypatch.setattr(files.s3_service, "delete_file", delete_file)
+    return state
+
+
+def test_delete_retries_transient_database_errors(files_table, s3_deletes):
+    files_table.fail_next = {"PATCH": 1, "GET": 1, "DELETE": 1}
+
+    response = client.delete("/api/v1/files/file-1")
+
+    assert response.status_code == 200
+    assert s3_deletes["deleted"] == [OBJECT_NAME]
+    assert files_table.hard_deletes == 1
+    assert files_table.rows == {}
+
+
+def test_delete_retried_after_partial_failure_completes_once(files_table, s3_deletes):
+    # S3 refuses every attempt of the first request, after the row was tombstoned
+    s3_deletes["fail"] = 4
+
+    first = client.delete("/api/v1/files/file-1")
+
+    assert first.status_code == 500
+    assert files_table.rows["file-1"]["deleted_at"] is not None
+    assert files_table.hard_deletes == 0
+
+    # The client retries the whole request; the tombstoned row is picked up again
+    second = client.delete("/api/v1/files/file-1")
+
+    assert second.status_code == 200
+    assert s3_deletes["deleted"] == [OBJECT_NAME]
+    assert files_table.hard_deletes == 1
+    assert files_table.rows == {}
+
+    # A third attempt finds nothing left to delete
+    assert client.delete("/api/v1/files/file-1").status_code == 404
+    assert s3_deletes["deleted"] == [OBJECT_NAME]
+    assert files_table.hard_deletes == 1
+
+
+def test_delete_keeps_objects_shared_by_deduplicated_uploads(files_table, s3_deletes):
+    files_table.rows["file-2"] = {"id": "file-2", "object_name": OBJECT_NAME, "user_id": USER["id"], "deleted_at": None}
+
+    response = client.delete("/api/v1/files/file-1")
+
+    assert response.status_code == 200
+    assert s3_deletes["calls"] == []
+    assert list(files_table.rows) == ["file-2"]